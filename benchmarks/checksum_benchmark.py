@@ -0,0 +1,81 @@
+"""
+Checksum address benchmark: the address work of the mint path
+(the mint contract address of every job and the account address of every
+account in every network) with `Web3.to_checksum_address` and
+`Account.from_key` as before and with the interned addresses.
+
+Launch from the project folder:
+    python -m benchmarks.checksum_benchmark
+"""
+import time
+
+from eth_account import Account
+from web3 import Web3
+
+from min_library.models.others.checksum_addresses import ChecksumAddresses
+from tasks.zk_bridge import ZkBridge
+
+ACCOUNTS_COUNT = 200
+LOOKUPS_COUNT = 100
+
+MINT_CONTRACTS = list(
+    ZkBridge.MINT_DATA_DICT['Polyhedra 2024']['networks'].values()
+)
+PRIVATE_KEYS = [
+    '0x' + (index + 1).to_bytes(32, 'big').hex()
+    for index in range(ACCOUNTS_COUNT)
+]
+
+
+def run_before() -> None:
+    for private_key in PRIVATE_KEYS:
+        for mint_contract in MINT_CONTRACTS:
+            Account.from_key(private_key)
+            Web3.to_checksum_address(mint_contract)
+
+
+def run_after() -> None:
+    accounts = {}
+    for private_key in PRIVATE_KEYS:
+        for mint_contract in MINT_CONTRACTS:
+            if private_key not in accounts:
+                accounts[private_key] = Account.from_key(private_key)
+                ChecksumAddresses.add(accounts[private_key].address)
+            ChecksumAddresses.get(mint_contract)
+
+
+def main():
+    jobs_count = ACCOUNTS_COUNT * len(MINT_CONTRACTS)
+
+    for title, run in (('before', run_before), ('interned', run_after)):
+        started_at = time.perf_counter()
+        run()
+        spent_time = time.perf_counter() - started_at
+        print(
+            f"{title:>8}: {jobs_count / spent_time:10.1f} jobs/sec, "
+            f"{spent_time * 1_000_000 / jobs_count:8.1f} µs per job"
+        )
+
+    started_at = time.perf_counter()
+    for _ in range(LOOKUPS_COUNT):
+        for mint_contract in MINT_CONTRACTS:
+            Web3.to_checksum_address(mint_contract)
+    to_checksum_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(LOOKUPS_COUNT):
+        for mint_contract in MINT_CONTRACTS:
+            ChecksumAddresses.get(mint_contract)
+    interned_time = time.perf_counter() - started_at
+
+    lookups_count = LOOKUPS_COUNT * len(MINT_CONTRACTS)
+    print(
+        f"Contract address only: to_checksum_address "
+        f"{to_checksum_time * 1_000_000 / lookups_count:.2f} µs, "
+        f"interned {interned_time * 1_000_000 / lookups_count:.2f} µs"
+    )
+    print(f"Cache: {ChecksumAddresses.STATS}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Signing benchmark: signatures per second and event-loop lag while signing
+inline (as before), in a thread pool and in a process pool.
+
+Launch from the project folder:
+    python -m benchmarks.signing_benchmark
+"""
+import asyncio
+import time
+
+from eth_account import Account
+
+from min_library.models.transactions.signer import Signer
+
+TRANSACTIONS_COUNT = 500
+TICK = 0.005
+
+
+async def measure_loop_lag(stop_event: asyncio.Event) -> float:
+    max_lag = 0.0
+
+    while not stop_event.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(TICK)
+        max_lag = max(max_lag, time.perf_counter() - started_at - TICK)
+
+    return max_lag
+
+
+async def run_case(executor_type: str | None) -> tuple[float, float]:
+    Signer.EXECUTOR_TYPE = executor_type
+    accounts = [
+        Account.from_key((index + 1).to_bytes(32, 'big'))
+        for index in range(TRANSACTIONS_COUNT)
+    ]
+    tx_params = {
+        'to': '0x7C3Aa07721578D00babdebF17c3352d7658b67fD',
+        'data': '0x1249c58b',
+        'value': 0,
+        'gas': 100_000,
+        'gasPrice': 10 ** 9,
+        'nonce': 0,
+        'chainId': 56
+    }
+
+    # Warm up the pool, so that its start isn't measured
+    await Signer.sign(accounts[0], tx_params)
+
+    stop_event = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop_event))
+    await asyncio.sleep(TICK)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[
+        Signer.sign(account, tx_params) for account in accounts
+    ])
+    spent_time = time.perf_counter() - started_at
+
+    stop_event.set()
+    max_lag = await lag_task
+    Signer.shutdown()
+
+    return TRANSACTIONS_COUNT / spent_time, max_lag
+
+
+async def main():
+    print(f"ECC backend: {Signer.get_backend_name()}")
+
+    for executor_type in (None, 'thread', 'process'):
+        signatures_per_second, max_lag = await run_case(executor_type)
+        print(
+            f"{executor_type or 'inline':>8}: {signatures_per_second:8.1f} signatures/sec, "
+            f"max event-loop lag {max_lag * 1000:7.2f} ms"
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import random
 import sys
 import time
@@ -6,7 +7,17 @@ from questionary import (
     questionary,
     Choice
 )
+from min_library.models.journal.run_journal import RunJournal
 from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.metrics.metrics import Metrics
+from min_library.models.network.new_heads_listener import NewHeadsListener
+from min_library.models.network.provider_registry import ProviderRegistry
+from min_library.models.scheduler.mint_plan import MintPlan
+from min_library.models.scheduler.network_lanes import NetworkLanes
+from min_library.models.scheduler.timeline_scheduler import TimelineScheduler
+from min_library.models.transactions.receipt_watcher import ReceiptWatcher
+from min_library.models.transactions.signer import Signer
+from tasks.eligibility_scanner import EligibilityScanner
 
 from min_library.utils.config import (
     ACCOUNT_NAMES,
@@ -16,12 +27,34 @@ from min_library.utils.helpers import (
     delay,
     format_output
 )
-from settings.modules_settings import mint_polyhedra_2024_nft
+from settings.modules_settings import (
+    BULK_MODULES,
+    MODULES_NFT_NAMES,
+    broadcast_presigned_txs,
+    get_mint_networks,
+    mint_nft_on_network,
+    mint_polyhedra_2024_nft,
+    presign_polyhedra_2024_nft
+)
 
 from settings.settings import (
+    DEFAULT_TIMELINE_NETWORK_SPACING,
     IS_ACCOUNT_NAMES,
+    IS_MINT_PLAN_IMPORT,
+    IS_PREFLIGHT_CHECK,
+    IS_RUN_JOURNAL,
     IS_SHUFFLE_WALLETS,
-    IS_SLEEP
+    IS_SLEEP,
+    IS_TIMELINE_SCHEDULER,
+    METRICS_FOLDER,
+    MINT_NETWORKS,
+    MINT_PLAN_FILE,
+    MINT_PLAN_SEED,
+    RUN_JOURNAL_FILE,
+    SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO,
+    SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM,
+    TIMELINE_NETWORK_SPACINGS,
+    WORKERS_COUNT
 )
 
 
@@ -68,7 +101,15 @@ def get_module():
                 "1) Mint 'Polyhedra 2024 NFT' on one or some chains configured in settings",
                 mint_polyhedra_2024_nft
             ),
-            Choice("2) Exit", "exit"),
+            Choice(
+                "2) Pre-sign 'Polyhedra 2024 NFT' mints of all wallets to a file",
+                presign_polyhedra_2024_nft
+            ),
+            Choice(
+                "3) Broadcast the pre-signed mints from the file",
+                broadcast_presigned_txs
+            ),
+            Choice("4) Exit", "exit"),
         ],
         qmark="⚙️ ",
         pointer="✅ "
@@ -101,10 +142,13 @@ def get_accounts():
 
 
 async def run_module(module, wallet):
+    if "networks" in wallet:
+        return await module(wallet["name"], wallet["key"], wallet["networks"])
+
     return await module(wallet["name"], wallet["key"])
 
 
-def measure_time_for_all_work(start_time: float):
+def measure_time_for_all_work(start_time: float, accounts_count: int = 0):
     end_time = round(time.time() - start_time, 2)
     seconds = round(end_time % 60, 2)
     minutes = int(end_time // 60) if end_time > 60 else 0
@@ -118,18 +162,143 @@ def measure_time_for_all_work(start_time: float):
         )
     )
 
+    if accounts_count and end_time:
+        throughput = round(accounts_count / (end_time / 60), 2)
+        logger.log(
+            20, f"Throughput: {throughput} accounts per minute"
+        )
+
+
+async def run_worker(module, queue: asyncio.Queue):
+    while not queue.empty():
+        account = queue.get_nowait()
+
+        try:
+            is_result = await run_module(module, account)
+        except Exception as e:
+            logger.error(f"{account['name']} | {e}")
+            is_result = False
+
+        if IS_SLEEP and not queue.empty() and is_result:
+            await delay(message='before next account')
+
+
+async def run_scheduler(module, accounts: list[dict]):
+    if IS_SLEEP:
+        scheduler = TimelineScheduler(
+            account_spacing=(
+                SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM,
+                SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO
+            ),
+            network_spacing=DEFAULT_TIMELINE_NETWORK_SPACING,
+            network_spacings=TIMELINE_NETWORK_SPACINGS
+        )
+    else:
+        scheduler = TimelineScheduler()
+
+    nft_name = MODULES_NFT_NAMES[module]
+    for account in accounts:
+        for network_name in account.get("networks", get_mint_networks()):
+            scheduler.add(
+                account_id=account["name"],
+                network_name=network_name,
+                func=functools.partial(
+                    mint_nft_on_network,
+                    account["name"], account["key"], nft_name, network_name
+                )
+            )
+
+    await scheduler.run()
+
+
+def get_planned_accounts(module, accounts: list[dict]) -> list[dict]:
+    if IS_MINT_PLAN_IMPORT:
+        plan = MintPlan.load(MINT_PLAN_FILE)
+        logger.info(f"The plan is loaded from {MINT_PLAN_FILE}")
+    else:
+        plan = MintPlan.compile(
+            account_ids=[account["name"] for account in accounts],
+            options=MINT_NETWORKS,
+            seed=MINT_PLAN_SEED,
+            is_shuffle_accounts=IS_SHUFFLE_WALLETS,
+            nft_name=MODULES_NFT_NAMES[module]
+        )
+        if MINT_PLAN_FILE:
+            plan.export(MINT_PLAN_FILE)
+    plan.report()
+
+    keys = {account["name"]: account["key"] for account in accounts}
+    planned_accounts = []
+    for account_name, network_names in plan.get_networks_by_account().items():
+        if account_name not in keys:
+            logger.warning(f"{account_name} | Not in the wallets, skipped")
+            continue
+
+        planned_accounts.append({
+            "name": account_name,
+            "key": keys[account_name],
+            "networks": network_names
+        })
+
+    return planned_accounts
+
+
+async def run_preflight(module, accounts: list[dict]) -> list[dict]:
+    scanner = EligibilityScanner(nft_name=MODULES_NFT_NAMES[module])
+    plan, _ = await scanner.scan(
+        plan={account["name"]: account["networks"] for account in accounts},
+        private_keys={account["name"]: account["key"] for account in accounts}
+    )
+
+    return [
+        {**account, "networks": plan[account["name"]]}
+        for account in accounts
+        if account["name"] in plan
+    ]
 
-async def main(module):
+
+async def main(module) -> int:
     accounts = get_accounts()
 
-    if IS_SHUFFLE_WALLETS:
+    if module in MODULES_NFT_NAMES:
+        accounts = get_planned_accounts(module, accounts)
+    elif IS_SHUFFLE_WALLETS:
         random.shuffle(accounts)
 
-    for account in accounts:
-        is_result = await run_module(module, account)
+    if IS_RUN_JOURNAL and module not in BULK_MODULES:
+        RunJournal.open(RUN_JOURNAL_FILE)
+        await RunJournal.reconcile()
 
-        if IS_SLEEP and account != accounts[-1] and is_result:
-            await delay(message='before next account')
+    if IS_PREFLIGHT_CHECK and module in MODULES_NFT_NAMES:
+        accounts = await run_preflight(module, accounts)
+
+    if module in BULK_MODULES:
+        await module(accounts)
+    elif IS_TIMELINE_SCHEDULER:
+        await run_scheduler(module, accounts)
+    else:
+        queue = asyncio.Queue()
+        for account in accounts:
+            queue.put_nowait(account)
+
+        workers_count = max(1, min(WORKERS_COUNT, len(accounts)))
+        await asyncio.gather(*[
+            run_worker(module, queue) for _ in range(workers_count)
+        ])
+
+    NetworkLanes.report()
+    ReceiptWatcher.report()
+    ProviderRegistry.report()
+    RunJournal.report()
+    if METRICS_FOLDER:
+        prometheus_path, json_path = Metrics.export(METRICS_FOLDER)
+        logger.info(f"Metrics are saved to {prometheus_path} and {json_path}")
+    RunJournal.close()
+    NewHeadsListener.stop_all()
+    await ProviderRegistry.close()
+    Signer.shutdown()
+
+    return len(accounts)
 
 if __name__ == '__main__':
     greetings()
@@ -147,7 +316,7 @@ if __name__ == '__main__':
         20, "The bot started to measure time for all work"
     )
 
-    asyncio.run(main(module_data))
+    accounts_count = asyncio.run(main(module_data))
 
-    measure_time_for_all_work(start_time)
+    measure_time_for_all_work(start_time, accounts_count)
     end_of_work()
@@ -1,23 +1,29 @@
 import logging
 import random
 import requests
+from collections import OrderedDict
 
+from hexbytes import HexBytes
 from web3 import Web3
-from web3.eth import AsyncEth
-from web3.middleware import async_geth_poa_middleware
+from eth_account import Account
 from eth_account.signers.local import LocalAccount
-from fake_useragent import UserAgent
 
 from min_library.models.logger.logger import CustomLogger
 from min_library.models.network.network import Network
 from min_library.models.network.networks import Networks
+from min_library.models.network.provider_registry import ProviderRegistry
+from min_library.models.others.checksum_addresses import ChecksumAddresses
 import min_library.models.others.exceptions as exceptions
+from settings.settings import ACCOUNTS_CACHE_SIZE
 
 
 class AccountManager:
     network: Network
     account: LocalAccount | None
     w3: Web3
+    # An account is derived from its key once for all networks, the cache
+    # is keyed by the account name, not by the key
+    ACCOUNTS: OrderedDict[int | str | None, LocalAccount] = OrderedDict()
 
     def __init__(
         self,
@@ -32,17 +38,11 @@ class AccountManager:
         self.network = network
         self.proxy = proxy
         self._initialize_proxy(check_proxy)
-        self._initialize_headers()
-
-        self.w3 = Web3(
-            Web3.AsyncHTTPProvider(
-                endpoint_uri=self.network.rpc,
-                request_kwargs={'proxy': self.proxy, 'headers': self.headers}
-            ),
-            modules={'eth': (AsyncEth,)},
-            middlewares=[]
+
+        self.w3 = ProviderRegistry.get_web3(
+            network=self.network,
+            proxy=self.proxy
         )
-        self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
 
         self._initialize_account(private_key)
         self._initialize_logger(create_log_file_per_account)
@@ -66,14 +66,6 @@ class AccountManager:
                     f"Proxy doesn't work! It's IP is {your_ip}"
                 )
 
-    def _initialize_headers(self):
-        self.headers = {
-            'Accept': '*/*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Content-Type': 'application/json',
-            'User-Agent': UserAgent().random
-        }
-
     def _initialize_logger(
         self, 
         create_log_file_per_account: bool
@@ -87,9 +79,7 @@ class AccountManager:
 
     def _initialize_account(self, private_key: str | None):
         if private_key:
-            self.account = self.w3.eth.account.from_key(
-                private_key=private_key
-            )
+            self.account = self.get_account(self.account_id, private_key)
 
         elif private_key == '':
             self.account = None
@@ -98,3 +88,35 @@ class AccountManager:
             self.account = self.w3.eth.account.create(
                 extra_entropy=str(random.randint(1, 999_999_999))
             )
+
+    @classmethod
+    def get_account(
+        cls,
+        account_id: int | str | None,
+        private_key: str
+    ) -> LocalAccount:
+        """
+        Get the account of the private key, derived once and cached by the
+        account name.
+
+        Args:
+            account_id (int | str | None): the account name or ID.
+            private_key (str): the private key.
+
+        Returns:
+            LocalAccount: the account.
+
+        """
+        account = cls.ACCOUNTS.get(account_id)
+
+        # Another key under the same name is derived again
+        if account is None or account.key != HexBytes(private_key):
+            account = Account.from_key(private_key)
+            ChecksumAddresses.add(account.address)
+            cls.ACCOUNTS[account_id] = account
+
+        cls.ACCOUNTS.move_to_end(account_id)
+        while len(cls.ACCOUNTS) > ACCOUNTS_CACHE_SIZE:
+            cls.ACCOUNTS.popitem(last=False)
+
+        return account
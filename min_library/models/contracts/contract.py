@@ -1,9 +1,15 @@
-from web3 import Web3
+from typing import Any
+
 from web3.contract import Contract, AsyncContract
 from web3.types import TxParams
 from eth_typing import ChecksumAddress
 
 from min_library.models.account.account_manager import AccountManager
+from min_library.models.contracts.contract_cache import (
+    CompiledFunction,
+    ContractCache
+)
+from min_library.models.others.checksum_addresses import ChecksumAddresses
 from min_library.models.others.params_types import ParamsTypes
 from min_library.models.others.token_amount import TokenAmount
 from min_library.models.transactions.transaction import Transaction
@@ -36,7 +42,7 @@ class Contract:
         else:
             address, abi = contract.address, contract.abi
 
-        return Web3.to_checksum_address(address), abi
+        return ChecksumAddresses.get(address), abi
 
     async def get(
         self,
@@ -44,7 +50,8 @@ class Contract:
         abi: list | str | None = None
     ) -> AsyncContract | Contract:
         """
-        Get a contract instance.
+        Get a contract instance. The instance is cached per network, address
+        and ABI, so it's created once for all accounts.
 
         Args:
             contract (ParamsTypes.Contract): the contract address or instance.
@@ -64,12 +71,85 @@ class Contract:
         if not abi:
             abi = contract_abi
 
-        contract = self.account_manager.w3.eth.contract(
-            address=contract_address, abi=abi
+        contract = ContractCache.get_contract(
+            w3=self.account_manager.w3,
+            chain_id=self.account_manager.network.chain_id,
+            address=contract_address,
+            abi=abi
         )
 
         return contract
 
+    async def _get_function(
+        self,
+        contract: ParamsTypes.Contract,
+        function_name: str,
+        args: tuple
+    ) -> tuple[ChecksumAddress, CompiledFunction]:
+        address, abi = await self.get_contract_attributes(contract)
+        if not abi:
+            raise ValueError("Can not get contract ABI")
+
+        function = ContractCache.get_function(
+            abi=abi, function_name=function_name, inputs_count=len(args)
+        )
+
+        return address, function
+
+    async def encode_call(
+        self,
+        contract: ParamsTypes.Contract,
+        function_name: str,
+        *args: Any
+    ) -> str:
+        """
+        Encode the call data of the contract function with the precompiled
+        encoder, without building web3's contract function objects.
+
+        Args:
+            contract (ParamsTypes.Contract): the contract instance with ABI.
+            function_name (str): the function name.
+            *args (Any): the arguments of the function.
+
+        Returns:
+            str: the call data.
+
+        """
+        _, function = await self._get_function(contract, function_name, args)
+
+        return function.encode(*args)
+
+    async def call(
+        self,
+        contract: ParamsTypes.Contract,
+        function_name: str,
+        *args: Any
+    ) -> Any:
+        """
+        Call the read function of the contract with the precompiled encoder
+        and decoder.
+
+        Args:
+            contract (ParamsTypes.Contract): the contract instance with ABI.
+            function_name (str): the function name.
+            *args (Any): the arguments of the function.
+
+        Returns:
+            Any: the returned value or a tuple of them if there are several.
+
+        """
+        address, function = await self._get_function(
+            contract, function_name, args
+        )
+
+        data = await self.account_manager.w3.eth.call({
+            'to': address,
+            'data': function.encode(*args)
+        })
+        result = function.decode(data)
+
+        return result[0] if len(result) == 1 else result
+
     async def get_decimals(
         self,
         token_contract: ParamsTypes.Contract
@@ -0,0 +1,221 @@
+import json
+from typing import Any
+
+from eth_abi.codec import ABICodec
+from eth_abi.decoding import TupleDecoder
+from eth_abi.encoding import TupleEncoder
+from eth_typing import ChecksumAddress, HexStr
+from eth_utils import function_abi_to_4byte_selector, keccak
+from web3 import Web3
+from web3._utils.abi import (
+    build_strict_registry,
+    get_abi_input_types,
+    get_abi_output_types
+)
+from web3.contract import AsyncContract
+
+from min_library.models.others.common import AutoRepr
+
+
+class CompiledFunction(AutoRepr):
+    """
+    A contract function with its selector and the eth_abi encoder of its
+    inputs and decoder of its outputs built once.
+
+    Attributes:
+        name (str): the function name.
+        selector (bytes): the 4-byte function selector.
+        input_types (list[str]): the ABI types of the inputs.
+        output_types (list[str]): the ABI types of the outputs.
+
+    """
+    name: str
+    selector: bytes
+    input_types: list[str]
+    output_types: list[str]
+
+    def __init__(self, function_abi: dict, codec: ABICodec) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            function_abi (dict): the ABI of the function.
+            codec (ABICodec): the codec whose registry builds the encoders.
+
+        """
+        self.name = function_abi['name']
+        self.selector = function_abi_to_4byte_selector(function_abi)
+        self.input_types = get_abi_input_types(function_abi)
+        self.output_types = get_abi_output_types(function_abi)
+        self._stream_class = codec.stream_class
+        self._encoder = TupleEncoder(encoders=[
+            codec._registry.get_encoder(input_type)
+            for input_type in self.input_types
+        ])
+        self._decoder = TupleDecoder(decoders=[
+            codec._registry.get_decoder(output_type)
+            for output_type in self.output_types
+        ])
+
+    def encode(self, *args: Any) -> HexStr:
+        """
+        Encode the call data of the function.
+
+        Args:
+            *args (Any): the arguments of the function.
+
+        Returns:
+            HexStr: the call data.
+
+        """
+        return HexStr('0x' + (self.selector + self._encoder(args)).hex())
+
+    def decode(self, data: bytes) -> tuple[Any, ...]:
+        """
+        Decode the returned data of the function.
+
+        Args:
+            data (bytes): the returned data.
+
+        Returns:
+            tuple[Any, ...]: the returned values.
+
+        """
+        return self._decoder(self._stream_class(bytes(data)))
+
+
+class ContractCache:
+    """
+    A process-wide cache of parsed ABIs, contract instances keyed by
+    (chain, address, ABI hash) and compiled functions keyed by
+    (ABI hash, function name, inputs count), so that the contract setup is
+    done once for all accounts.
+
+    """
+    CODEC: ABICodec = ABICodec(build_strict_registry())
+    ABIS: dict[str, list[dict[str, Any]]] = {}
+    CONTRACTS: dict[tuple[int, int, ChecksumAddress, str], AsyncContract] = {}
+    FUNCTIONS: dict[tuple[str, str, int | None], CompiledFunction] = {}
+    _ABI_HASHES: dict[int, tuple[list, str]] = {}
+    _JSON_HASHES: dict[str, str] = {}
+
+    @classmethod
+    def parse_abi(cls, abi: list[dict[str, Any]] | str) -> list[dict[str, Any]]:
+        """
+        Get the parsed ABI, a JSON string is parsed only once.
+
+        Args:
+            abi (list[dict[str, Any]] | str): the ABI or its JSON.
+
+        Returns:
+            list[dict[str, Any]]: the parsed ABI.
+
+        """
+        return cls.ABIS[cls.get_abi_hash(abi)]
+
+    @classmethod
+    def get_abi_hash(cls, abi: list[dict[str, Any]] | str) -> str:
+        """
+        Get the hash of the ABI and keep the parsed ABI under it.
+
+        Args:
+            abi (list[dict[str, Any]] | str): the ABI or its JSON.
+
+        Returns:
+            str: the hash of the ABI.
+
+        """
+        if isinstance(abi, str):
+            if abi not in cls._JSON_HASHES:
+                cls._JSON_HASHES[abi] = cls._add_abi(json.loads(abi))
+
+            return cls._JSON_HASHES[abi]
+
+        # The list is kept in the cache, so its id can't be reused
+        if id(abi) not in cls._ABI_HASHES:
+            cls._ABI_HASHES[id(abi)] = (abi, cls._add_abi(abi))
+
+        return cls._ABI_HASHES[id(abi)][1]
+
+    @classmethod
+    def _add_abi(cls, abi: list[dict[str, Any]]) -> str:
+        abi_hash = keccak(
+            text=json.dumps(abi, sort_keys=True, separators=(',', ':'))
+        ).hex()
+        cls.ABIS.setdefault(abi_hash, abi)
+
+        return abi_hash
+
+    @classmethod
+    def get_contract(
+        cls,
+        w3: Web3,
+        chain_id: int,
+        address: ChecksumAddress,
+        abi: list[dict[str, Any]] | str
+    ) -> AsyncContract:
+        """
+        Get the contract instance, it's created once per Web3 instance.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+            chain_id (int): the chain ID.
+            address (ChecksumAddress): the contract address.
+            abi (list[dict[str, Any]] | str): the contract ABI or its JSON.
+
+        Returns:
+            AsyncContract: the contract instance.
+
+        """
+        abi_hash = cls.get_abi_hash(abi)
+        key = (id(w3), chain_id, address, abi_hash)
+
+        if key not in cls.CONTRACTS:
+            cls.CONTRACTS[key] = w3.eth.contract(
+                address=address, abi=cls.ABIS[abi_hash]
+            )
+
+        return cls.CONTRACTS[key]
+
+    @classmethod
+    def get_function(
+        cls,
+        abi: list[dict[str, Any]] | str,
+        function_name: str,
+        inputs_count: int | None = None
+    ) -> CompiledFunction:
+        """
+        Get the compiled function of the ABI.
+
+        Args:
+            abi (list[dict[str, Any]] | str): the contract ABI or its JSON.
+            function_name (str): the function name.
+            inputs_count (int | None): the count of the inputs to choose
+                an overloaded function by. (None)
+
+        Returns:
+            CompiledFunction: the compiled function.
+
+        """
+        abi_hash = cls.get_abi_hash(abi)
+        key = (abi_hash, function_name, inputs_count)
+
+        if key not in cls.FUNCTIONS:
+            function_abis = [
+                item for item in cls.ABIS[abi_hash]
+                if item.get('type', 'function') == 'function'
+                and item.get('name') == function_name
+                and (
+                    inputs_count is None
+                    or len(item.get('inputs', [])) == inputs_count
+                )
+            ]
+            if len(function_abis) != 1:
+                raise ValueError(
+                    f"Found {len(function_abis)} '{function_name}' "
+                    f"functions in the ABI"
+                )
+
+            cls.FUNCTIONS[key] = CompiledFunction(function_abis[0], cls.CODEC)
+
+        return cls.FUNCTIONS[key]
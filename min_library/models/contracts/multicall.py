@@ -0,0 +1,254 @@
+import asyncio
+from typing import Any
+
+from aiohttp import ClientResponseError
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from min_library.models.contracts.contract_cache import (
+    CompiledFunction,
+    ContractCache
+)
+from min_library.models.network.network import Network
+from min_library.models.network.provider_registry import ProviderRegistry
+from min_library.models.others.checksum_addresses import ChecksumAddresses
+from min_library.models.others.params_types import ParamsTypes
+from min_library.models.others.token_amount import TokenAmount
+from settings.settings import (
+    MULTICALL_CHUNK_SIZE,
+    MULTICALL_CONCURRENCY
+)
+
+# A call of the aggregation: the target, the function and its arguments
+Call = tuple[ParamsTypes.Address, CompiledFunction, tuple]
+
+
+class Multicall:
+    """
+    Bulk reads through the Multicall3 contract: many eth_calls are packed
+    into `aggregate3` calls of MULTICALL_CHUNK_SIZE calls each, up to
+    MULTICALL_CONCURRENCY of them at once. A failed call gives None instead
+    of failing the others.
+
+    A chunk the RPC refuses (a JSON-RPC error such as out of gas, or an HTTP
+    400 or 413 for an oversized payload) is split in halves until the
+    halves go through.
+
+    """
+    SPLIT_STATUSES: tuple[int, ...] = (400, 413)
+    ADDRESS: ChecksumAddress = ChecksumAddresses.get(
+        '0xcA11bde05977b3631167028862bE2a173976CA11'
+    )
+    ABI: list[dict[str, Any]] = [
+        {
+            'name': 'aggregate3',
+            'type': 'function',
+            'stateMutability': 'payable',
+            'inputs': [{
+                'name': 'calls',
+                'type': 'tuple[]',
+                'components': [
+                    {'name': 'target', 'type': 'address'},
+                    {'name': 'allowFailure', 'type': 'bool'},
+                    {'name': 'callData', 'type': 'bytes'}
+                ]
+            }],
+            'outputs': [{
+                'name': 'returnData',
+                'type': 'tuple[]',
+                'components': [
+                    {'name': 'success', 'type': 'bool'},
+                    {'name': 'returnData', 'type': 'bytes'}
+                ]
+            }]
+        },
+        {
+            'name': 'getEthBalance',
+            'type': 'function',
+            'stateMutability': 'view',
+            'inputs': [{'name': 'addr', 'type': 'address'}],
+            'outputs': [{'name': 'balance', 'type': 'uint256'}]
+        }
+    ]
+    BALANCE_OF_ABI: list[dict[str, Any]] = [
+        {
+            'name': 'balanceOf',
+            'type': 'function',
+            'stateMutability': 'view',
+            'inputs': [{'name': 'owner', 'type': 'address'}],
+            'outputs': [{'name': 'balance', 'type': 'uint256'}]
+        }
+    ]
+
+    @classmethod
+    def is_refused_error(cls, error: Exception) -> bool:
+        if isinstance(error, ClientResponseError):
+            return error.status in cls.SPLIT_STATUSES
+
+        return isinstance(error, ValueError)
+
+    @classmethod
+    async def _aggregate_chunk(
+        cls,
+        w3: Web3,
+        calls: list[Call],
+        semaphore: asyncio.Semaphore
+    ) -> list[Any]:
+        aggregate3 = ContractCache.get_function(cls.ABI, 'aggregate3')
+        call_datas = [
+            (
+                ChecksumAddresses.get(target),
+                True,
+                bytes.fromhex(function.encode(*args)[2:])
+            )
+            for target, function, args in calls
+        ]
+
+        try:
+            async with semaphore:
+                data = await w3.eth.call({
+                    'to': cls.ADDRESS,
+                    'data': aggregate3.encode(call_datas)
+                })
+        except Exception as e:
+            # The RPC refused the call: too many calls for its gas, payload
+            # or response limits, so the chunk is split in halves
+            if len(calls) == 1 or not cls.is_refused_error(e):
+                raise
+
+            middle = len(calls) // 2
+            first_results, last_results = await asyncio.gather(
+                cls._aggregate_chunk(w3, calls[:middle], semaphore),
+                cls._aggregate_chunk(w3, calls[middle:], semaphore)
+            )
+            return first_results + last_results
+
+        results = []
+        for (_, function, _), (success, return_data) in zip(
+            calls, aggregate3.decode(data)[0]
+        ):
+            if not success or not return_data:
+                results.append(None)
+                continue
+
+            result = function.decode(return_data)
+            results.append(result[0] if len(result) == 1 else result)
+
+        return results
+
+    @classmethod
+    async def aggregate(
+        cls,
+        calls: list[Call],
+        network: Network,
+        w3: Web3 | None = None
+    ) -> list[Any]:
+        """
+        Make the read calls in bulk.
+
+        Args:
+            calls (list[Call]): the (target, compiled function, arguments)
+                of the calls.
+            network (Network): the network.
+            w3 (Web3 | None): the Web3 instance to call with, for example a
+                local node. (the shared one of the network)
+
+        Returns:
+            list[Any]: the results in order of the calls, the returned value
+                or a tuple of them if there are several, None for the
+                failed calls.
+
+        """
+        w3 = w3 or ProviderRegistry.get_web3(network)
+        semaphore = asyncio.Semaphore(MULTICALL_CONCURRENCY)
+
+        chunks_results = await asyncio.gather(*[
+            cls._aggregate_chunk(
+                w3, calls[index:index + MULTICALL_CHUNK_SIZE], semaphore
+            )
+            for index in range(0, len(calls), MULTICALL_CHUNK_SIZE)
+        ])
+
+        return [
+            result
+            for chunk_results in chunks_results
+            for result in chunk_results
+        ]
+
+    @classmethod
+    async def balances(
+        cls,
+        addresses: list[ParamsTypes.Address],
+        network: Network,
+        w3: Web3 | None = None
+    ) -> dict[ChecksumAddress, TokenAmount | None]:
+        """
+        Get the native coin balances of the addresses.
+
+        Args:
+            addresses (list[ParamsTypes.Address]): the addresses.
+            network (Network): the network.
+            w3 (Web3 | None): the Web3 instance to call with. (the shared
+                one of the network)
+
+        Returns:
+            dict[ChecksumAddress, TokenAmount | None]: the balances, None if
+                the balance was not received.
+
+        """
+        get_eth_balance = ContractCache.get_function(cls.ABI, 'getEthBalance')
+        addresses = [ChecksumAddresses.get(address) for address in addresses]
+
+        results = await cls.aggregate(
+            calls=[
+                (cls.ADDRESS, get_eth_balance, (address,))
+                for address in addresses
+            ],
+            network=network,
+            w3=w3
+        )
+
+        return {
+            address: (
+                None if balance is None else
+                TokenAmount(amount=balance, decimals=network.decimals, wei=True)
+            )
+            for address, balance in zip(addresses, results)
+        }
+
+    @classmethod
+    async def token_balances(
+        cls,
+        token: ParamsTypes.Address,
+        addresses: list[ParamsTypes.Address],
+        network: Network,
+        w3: Web3 | None = None
+    ) -> dict[ChecksumAddress, int | None]:
+        """
+        Get the `balanceOf` of the addresses in the token or NFT contract.
+
+        Args:
+            token (ParamsTypes.Address): the token or NFT contract address.
+            addresses (list[ParamsTypes.Address]): the addresses.
+            network (Network): the network.
+            w3 (Web3 | None): the Web3 instance to call with. (the shared
+                one of the network)
+
+        Returns:
+            dict[ChecksumAddress, int | None]: the balances in the smallest
+                units (the count of NFTs), None if the balance was not
+                received.
+
+        """
+        balance_of = ContractCache.get_function(
+            cls.BALANCE_OF_ABI, 'balanceOf'
+        )
+        addresses = [ChecksumAddresses.get(address) for address in addresses]
+
+        results = await cls.aggregate(
+            calls=[(token, balance_of, (address,)) for address in addresses],
+            network=network,
+            w3=w3
+        )
+
+        return dict(zip(addresses, results))
@@ -1,12 +1,9 @@
-import json
-
-from web3 import (
-    Web3,
-    types
-)
+from web3 import types
 from typing import Any
 from eth_typing import ChecksumAddress
 
+from min_library.models.contracts.contract_cache import ContractCache
+from min_library.models.others.checksum_addresses import ChecksumAddresses
 from min_library.models.others.common import AutoRepr
 
 
@@ -41,5 +38,5 @@ class RawContract(AutoRepr):
             is_native_token (bool): is this contract native token of network (False)
         """
         self.title = title
-        self.address = Web3.to_checksum_address(address)
-        self.abi = json.loads(abi) if isinstance(abi, str) else abi
+        self.address = ChecksumAddresses.get(address)
+        self.abi = ContractCache.parse_abi(abi)
@@ -0,0 +1,226 @@
+import sqlite3
+
+from eth_typing import ChecksumAddress
+from eth_utils import keccak
+from web3 import Web3
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.others.checksum_addresses import ChecksumAddresses
+
+
+class MintIndex:
+    """
+    A local SQLite index of the addresses that minted tokens of a contract,
+    built from the Transfer logs from the zero address.
+
+    The logs are fetched with eth_getLogs over adaptive block ranges: a
+    range grows while the RPC answers and is split when the RPC refuses it
+    as too large. The last synced block is saved per chain and contract
+    with every range, so a later or an interrupted sync only fetches the new
+    blocks. The minters are kept in memory, so lookups cost no RPC.
+
+    """
+    TRANSFER_TOPIC: str = '0x' + keccak(
+        text='Transfer(address,address,uint256)'
+    ).hex()
+    ZERO_ADDRESS_TOPIC: str = '0x' + '00' * 32
+    TOO_LARGE_ERRORS: tuple[str, ...] = (
+        'too large',
+        'too many',
+        'more than',
+        'limit exceeded',
+        'block range',
+        'range is too',
+        'response size',
+        'query timeout',
+    )
+
+    def __init__(
+        self,
+        path: str,
+        initial_range: int = 2_000,
+        max_range: int = 100_000,
+        confirmations: int = 5
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            path (str): the path of the SQLite file.
+            initial_range (int): the blocks of the first eth_getLogs. (2000)
+            max_range (int): the most blocks of one eth_getLogs. (100000)
+            confirmations (int): the latest blocks that are not synced yet,
+                as they may be reorganized. (5)
+
+        """
+        self.path = path
+        self.initial_range = initial_range
+        self.max_range = max_range
+        self.confirmations = confirmations
+        self._minters: dict[tuple[int, str], set[ChecksumAddress]] = {}
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS sync_state (
+                chain_id INTEGER NOT NULL,
+                contract TEXT NOT NULL,
+                last_block INTEGER NOT NULL,
+                PRIMARY KEY (chain_id, contract)
+            );
+            CREATE TABLE IF NOT EXISTS minters (
+                chain_id INTEGER NOT NULL,
+                contract TEXT NOT NULL,
+                address TEXT NOT NULL,
+                block_number INTEGER NOT NULL,
+                PRIMARY KEY (chain_id, contract, address)
+            );
+        ''')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get_last_block(self, chain_id: int, contract: str) -> int | None:
+        row = self.connection.execute(
+            'SELECT last_block FROM sync_state '
+            'WHERE chain_id = ? AND contract = ?',
+            (chain_id, contract.lower())
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def get_minters(
+        self,
+        chain_id: int,
+        contract: str
+    ) -> set[ChecksumAddress]:
+        """
+        Get the addresses that minted tokens of the contract.
+
+        Args:
+            chain_id (int): the chain ID.
+            contract (str): the contract address.
+
+        Returns:
+            set[ChecksumAddress]: the minters.
+
+        """
+        key = (chain_id, contract.lower())
+
+        if key not in self._minters:
+            rows = self.connection.execute(
+                'SELECT address FROM minters '
+                'WHERE chain_id = ? AND contract = ?',
+                key
+            )
+            self._minters[key] = {
+                ChecksumAddresses.get(address) for address, in rows
+            }
+
+        return self._minters[key]
+
+    def is_minted(self, chain_id: int, contract: str, address: str) -> bool:
+        return ChecksumAddresses.get(address) in self.get_minters(
+            chain_id, contract
+        )
+
+    def _save_range(
+        self,
+        chain_id: int,
+        contract: str,
+        logs: list[dict],
+        to_block: int
+    ) -> None:
+        minters = self.get_minters(chain_id, contract)
+        rows = []
+        for log in logs:
+            address = ChecksumAddresses.get(bytes(log['topics'][2])[-20:])
+            minters.add(address)
+            rows.append((
+                chain_id, contract.lower(), address, log['blockNumber']
+            ))
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO minters '
+                '(chain_id, contract, address, block_number) '
+                'VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self.connection.execute(
+                'INSERT OR REPLACE INTO sync_state '
+                '(chain_id, contract, last_block) VALUES (?, ?, ?)',
+                (chain_id, contract.lower(), to_block)
+            )
+
+    @classmethod
+    def is_too_large_error(cls, error: Exception) -> bool:
+        message = str(error).lower()
+
+        return any(text in message for text in cls.TOO_LARGE_ERRORS)
+
+    async def sync(
+        self,
+        w3: Web3,
+        chain_id: int,
+        contract: str,
+        start_block: int | None
+    ) -> set[ChecksumAddress]:
+        """
+        Fetch the mints of the blocks after the last synced one.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+            chain_id (int): the chain ID.
+            contract (str): the contract address.
+            start_block (int | None): the block the contract was deployed
+                in, the first sync starts from it. A first sync from the
+                genesis would split millions of ranges, so it's refused.
+
+        Returns:
+            set[ChecksumAddress]: the minters.
+
+        """
+        logger = ConsoleLoggerSingleton.get_logger()
+        last_block = self.get_last_block(chain_id, contract)
+        if last_block is None and not start_block:
+            raise ValueError(
+                f'No deploy block of {contract} on chain {chain_id}, the '
+                f'first sync is not started from the genesis'
+            )
+
+        from_block = start_block if last_block is None else last_block + 1
+        to_block = await w3.eth.block_number - self.confirmations
+        block_range = self.initial_range
+        max_range = self.max_range
+        logs_count = 0
+
+        while from_block <= to_block:
+            range_end = min(from_block + block_range - 1, to_block)
+
+            try:
+                logs = await w3.eth.get_logs({
+                    'address': ChecksumAddresses.get(contract),
+                    'fromBlock': from_block,
+                    'toBlock': range_end,
+                    'topics': [self.TRANSFER_TOPIC, self.ZERO_ADDRESS_TOPIC]
+                })
+            except Exception as e:
+                if block_range == 1 or not self.is_too_large_error(e):
+                    raise
+
+                # The refused range is not tried again in this sync
+                max_range = max(block_range // 2, 1)
+                block_range = max_range
+                continue
+
+            self._save_range(chain_id, contract, logs, range_end)
+            logs_count += len(logs)
+            from_block = range_end + 1
+            block_range = min(block_range * 2, max_range)
+
+        if logs_count:
+            logger.info(
+                f"Mint index {chain_id} {contract}: {logs_count} new mints"
+            )
+
+        return self.get_minters(chain_id, contract)
@@ -0,0 +1,261 @@
+import asyncio
+import sqlite3
+import time
+from collections import defaultdict
+
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+
+from min_library.models.contracts.multicall import Multicall
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.network.networks import Networks
+from min_library.models.network.provider_registry import ProviderRegistry
+from min_library.models.others.checksum_addresses import ChecksumAddresses
+
+# A job of the run: the account address, the network name and the NFT name
+Job = tuple[str, str, str]
+
+
+class RunJournal:
+    """
+    An append-only journal of the mint jobs in a SQLite file, so a run that
+    died halfway can be started again without redoing the finished jobs.
+
+    Every change of a job state is a new row, the last row of a job is its
+    state. A job is `sent` as soon as its transaction is broadcast, so on
+    the next run it is not sent again: its hash is reconciled with the
+    chain first. The journal does nothing until it is opened.
+
+    """
+    SENT = 'sent'
+    MINTED = 'minted'
+    FAILED = 'failed'
+    DROPPED = 'dropped'
+    # The jobs in these states are not run again
+    SKIPPED_STATES: tuple[str, ...] = (SENT, MINTED)
+
+    CONNECTION: sqlite3.Connection | None = None
+    JOBS: dict[Job, dict] = {}
+
+    @classmethod
+    def open(cls, path: str) -> None:
+        """
+        Open the journal and load the last states of the jobs.
+
+        Args:
+            path (str): the path of the SQLite file.
+
+        """
+        cls.CONNECTION = sqlite3.connect(path)
+        cls.CONNECTION.row_factory = sqlite3.Row
+        cls.CONNECTION.executescript('''
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                address TEXT NOT NULL,
+                network TEXT NOT NULL,
+                nft TEXT NOT NULL,
+                state TEXT NOT NULL,
+                account TEXT,
+                contract TEXT,
+                tx_hash TEXT,
+                nonce INTEGER,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_key
+                ON jobs (address, network, nft, id);
+        ''')
+
+        rows = cls.CONNECTION.execute('''
+            SELECT * FROM jobs WHERE id IN (
+                SELECT MAX(id) FROM jobs GROUP BY address, network, nft
+            )
+        ''')
+        cls.JOBS = {
+            (row['address'], row['network'], row['nft']): dict(row)
+            for row in rows
+        }
+
+    @classmethod
+    def close(cls) -> None:
+        if cls.CONNECTION:
+            cls.CONNECTION.close()
+        cls.CONNECTION = None
+        cls.JOBS = {}
+
+    @classmethod
+    def get_state(cls, address: str, network: str, nft: str) -> str | None:
+        job = cls.JOBS.get((ChecksumAddresses.get(address), network, nft))
+
+        return job['state'] if job else None
+
+    @classmethod
+    def is_skipped(cls, address: str, network: str, nft: str) -> bool:
+        return cls.get_state(address, network, nft) in cls.SKIPPED_STATES
+
+    @classmethod
+    def record(
+        cls,
+        address: str,
+        network: str,
+        nft: str,
+        state: str,
+        account: str | int | None = None,
+        contract: str | None = None,
+        tx_hash: HexBytes | str | None = None,
+        nonce: int | None = None
+    ) -> None:
+        """
+        Append the new state of a job, nothing is done if the journal is
+        not opened.
+
+        Args:
+            address (str): the account address.
+            network (str): the network name.
+            nft (str): the NFT name.
+            state (str): the new state of the job.
+            account (str | int | None): the account name. (None)
+            contract (str | None): the mint contract address, needed to
+                reconcile a sent job. (None)
+            tx_hash (HexBytes | str | None): the transaction hash. (None)
+            nonce (int | None): the transaction nonce. (None)
+
+        """
+        if not cls.CONNECTION:
+            return
+
+        if isinstance(tx_hash, bytes):
+            tx_hash = HexBytes(tx_hash).hex()
+
+        job = {
+            'address': ChecksumAddresses.get(address),
+            'network': network,
+            'nft': nft,
+            'state': state,
+            'account': None if account is None else str(account),
+            'contract': contract,
+            'tx_hash': tx_hash,
+            'nonce': nonce,
+            'created_at': time.time()
+        }
+        with cls.CONNECTION:
+            cursor = cls.CONNECTION.execute(
+                f'INSERT INTO jobs ({", ".join(job)}) '
+                f'VALUES ({", ".join("?" * len(job))})',
+                tuple(job.values())
+            )
+
+        job['id'] = cursor.lastrowid
+        cls.JOBS[(job['address'], network, nft)] = job
+
+    @classmethod
+    async def _reconcile_job(cls, job: dict) -> str | None:
+        network = Networks.get_network(network_name=job['network'])
+        w3 = ProviderRegistry.get_web3(network)
+
+        try:
+            receipt = await w3.eth.get_transaction_receipt(job['tx_hash'])
+            return cls.MINTED if receipt['status'] == 1 else cls.FAILED
+        except TransactionNotFound:
+            pass
+
+        try:
+            await w3.eth.get_transaction(job['tx_hash'])
+            # Still in the mempool, it is left to land
+            return cls.SENT
+        except TransactionNotFound:
+            pass
+
+        nonce = await w3.eth.get_transaction_count(job['address'])
+        if job['nonce'] is not None and nonce <= job['nonce']:
+            return cls.DROPPED
+
+        # The nonce is used by another transaction, for example a fee
+        # bumped replacement, so the NFT balance tells if it was minted
+        return None
+
+    @classmethod
+    async def reconcile(cls) -> None:
+        """
+        Settle the jobs that were sent but not finished in the previous run
+        by the chain state instead of sending them again: a job is minted or
+        failed by its receipt or by the NFT balance if its nonce was used by
+        another transaction, stays sent while its transaction is in the
+        mempool and is dropped, to be run again, otherwise.
+
+        """
+        logger = ConsoleLoggerSingleton.get_logger()
+        jobs = [job for job in cls.JOBS.values() if job['state'] == cls.SENT]
+        if not jobs:
+            return
+
+        results = await asyncio.gather(*[
+            cls._reconcile_job(job) for job in jobs
+        ], return_exceptions=True)
+
+        states = {}
+        jobs_by_contract = defaultdict(list)
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Journal {job['network']} {job['tx_hash']}: not "
+                    f"reconciled, the job is skipped: {result}"
+                )
+            elif result is None:
+                jobs_by_contract[(job['network'], job['contract'])].append(job)
+            else:
+                states[id(job)] = result
+
+        for (network_name, contract), contract_jobs in jobs_by_contract.items():
+            try:
+                nft_balances = await Multicall.token_balances(
+                    token=contract,
+                    addresses=[job['address'] for job in contract_jobs],
+                    network=Networks.get_network(network_name=network_name)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Journal {network_name}: not reconciled, the jobs are "
+                    f"skipped: {e}"
+                )
+                continue
+
+            for job in contract_jobs:
+                nft_balance = nft_balances[ChecksumAddresses.get(job['address'])]
+                if nft_balance is not None:
+                    states[id(job)] = cls.MINTED if nft_balance else cls.FAILED
+
+        counts = defaultdict(int)
+        for job in jobs:
+            state = states.get(id(job), cls.SENT)
+            counts[state] += 1
+
+            if state != cls.SENT:
+                cls.record(
+                    address=job['address'],
+                    network=job['network'],
+                    nft=job['nft'],
+                    state=state,
+                    account=job['account'],
+                    contract=job['contract'],
+                    tx_hash=job['tx_hash'],
+                    nonce=job['nonce']
+                )
+
+        logger.info(
+            f"Journal: {len(jobs)} sent jobs reconciled, "
+            + ", ".join(f"{count} {state}" for state, count in counts.items())
+        )
+
+    @classmethod
+    def report(cls) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+        counts = defaultdict(int)
+        for job in cls.JOBS.values():
+            counts[job['state']] += 1
+
+        if counts:
+            logger.info(
+                "Journal: "
+                + ", ".join(f"{count} {state}" for state, count in counts.items())
+            )
@@ -0,0 +1,295 @@
+import asyncio
+import bisect
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+from urllib.parse import urlparse
+
+from min_library.models.others.common import AutoRepr
+
+
+class Histogram(AutoRepr):
+    """
+    A latency histogram with cumulative buckets, as Prometheus has them.
+
+    Attributes:
+        buckets (tuple[float, ...]): the upper bounds of the buckets in
+            seconds.
+        counts (list[int]): the count of the samples of every bucket, the
+            last one is for the samples above all the bounds.
+        count (int): the count of the samples.
+        sum (float): the sum of the samples in seconds.
+        max (float): the longest sample in seconds.
+
+    """
+    buckets: tuple[float, ...]
+    counts: list[int]
+    count: int
+    sum: float
+    max: float
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def get_cumulative_counts(self) -> list[int]:
+        cumulative_counts = []
+        total = 0
+        for count in self.counts:
+            total += count
+            cumulative_counts.append(total)
+
+        return cumulative_counts
+
+    def get_quantile(self, quantile: float) -> float:
+        """
+        Get the upper bound of the bucket the quantile falls into.
+
+        Args:
+            quantile (float): the quantile from 0 to 1.
+
+        Returns:
+            float: the upper bound in seconds, the longest sample for
+                the samples above all the bounds.
+
+        """
+        rank = quantile * self.count
+        for bound, cumulative_count in zip(
+            self.buckets, self.get_cumulative_counts()
+        ):
+            if cumulative_count >= rank:
+                return bound
+
+        return self.max
+
+
+class Metrics:
+    """
+    Process-wide latency histograms of the transaction stages labeled by
+    network and, for the stages of one RPC, endpoint, and RPC call counters
+    labeled by network, endpoint and method.
+
+    Stages:
+        auto_add_params - filling the nonce, fees and gas of a transaction;
+        estimate_gas - the gas estimation (a part of auto_add_params);
+        sign - signing;
+        broadcast - sending the raw transaction (with the endpoint);
+        receipt - waiting for the receipt (with the endpoint).
+
+    """
+    BUCKETS: tuple[float, ...] = (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1, 2.5, 5, 10, 30, 60, 120, 300
+    )
+    HISTOGRAMS: dict[tuple[str, str, str], Histogram] = {}
+    RPC_CALLS: dict[tuple[str, str, str], int] = {}
+    RPC_ERRORS: dict[tuple[str, str, str], int] = {}
+
+    @classmethod
+    def observe(
+        cls,
+        stage: str,
+        network: str,
+        seconds: float,
+        endpoint: str = ''
+    ) -> None:
+        key = (stage, network, endpoint)
+
+        if key not in cls.HISTOGRAMS:
+            cls.HISTOGRAMS[key] = Histogram(cls.BUCKETS)
+
+        cls.HISTOGRAMS[key].observe(seconds)
+
+    @classmethod
+    @contextmanager
+    def measure(
+        cls,
+        stage: str,
+        network: str,
+        get_endpoint: Callable[[], str] | None = None
+    ) -> Iterator[None]:
+        """
+        Measure the latency of the stage, failed attempts included. A
+        cancelled stage, e.g. the receipt wait of a replaced transaction,
+        is not counted.
+
+        Args:
+            stage (str): the stage.
+            network (str): the name of the network.
+            get_endpoint (Callable[[], str] | None): the function that gives
+                the url of the RPC the stage was done with when it's over.
+                (None)
+
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            cls._observe_stage(stage, network, started_at, get_endpoint)
+            raise
+
+        cls._observe_stage(stage, network, started_at, get_endpoint)
+
+    @classmethod
+    def _observe_stage(
+        cls,
+        stage: str,
+        network: str,
+        started_at: float,
+        get_endpoint: Callable[[], str] | None
+    ) -> None:
+        cls.observe(
+            stage,
+            network,
+            time.perf_counter() - started_at,
+            cls.get_endpoint_label(get_endpoint()) if get_endpoint else ''
+        )
+
+    @staticmethod
+    def get_endpoint_label(url: str) -> str:
+        # Long path parts are usually API keys, they don't get into files
+        parsed_url = urlparse(url)
+        path = '/'.join(
+            '***' if len(part) >= 24 else part
+            for part in parsed_url.path.split('/')
+        )
+
+        return parsed_url.netloc + path.rstrip('/')
+
+    @classmethod
+    def count_rpc_call(
+        cls,
+        network: str,
+        url: str,
+        methods: list[str],
+        is_error: bool = False
+    ) -> None:
+        """
+        Count the RPC calls of one HTTP request, a batch counts every call.
+
+        Args:
+            network (str): the name of the network.
+            url (str): the RPC url.
+            methods (list[str]): the methods of the calls.
+            is_error (bool): whether the request failed. (False)
+
+        """
+        counters = cls.RPC_ERRORS if is_error else cls.RPC_CALLS
+        endpoint = cls.get_endpoint_label(url)
+
+        for method in methods:
+            key = (network, endpoint, method)
+            counters[key] = counters.get(key, 0) + 1
+
+    @staticmethod
+    def _format_labels(**labels: str) -> str:
+        return ','.join(
+            f'{name}="{value}"' for name, value in labels.items()
+        )
+
+    @classmethod
+    def to_prometheus(cls) -> str:
+        lines = [
+            '# HELP tx_stage_seconds Latency of the transaction stages.',
+            '# TYPE tx_stage_seconds histogram'
+        ]
+        for (stage, network, endpoint), histogram in sorted(
+            cls.HISTOGRAMS.items()
+        ):
+            labels = cls._format_labels(
+                stage=stage, network=network, endpoint=endpoint
+            )
+            bounds = [str(bound) for bound in histogram.buckets] + ['+Inf']
+
+            for bound, cumulative_count in zip(
+                bounds, histogram.get_cumulative_counts()
+            ):
+                lines.append(
+                    f'tx_stage_seconds_bucket{{{labels},le="{bound}"}} '
+                    f'{cumulative_count}'
+                )
+            lines.append(f'tx_stage_seconds_sum{{{labels}}} {histogram.sum}')
+            lines.append(
+                f'tx_stage_seconds_count{{{labels}}} {histogram.count}'
+            )
+
+        for metric_name, counters, help_text in (
+            ('rpc_calls_total', cls.RPC_CALLS, 'RPC calls.'),
+            ('rpc_errors_total', cls.RPC_ERRORS, 'Failed RPC calls.')
+        ):
+            lines.append(f'# HELP {metric_name} {help_text}')
+            lines.append(f'# TYPE {metric_name} counter')
+            for (network, endpoint, method), count in sorted(counters.items()):
+                labels = cls._format_labels(
+                    network=network, endpoint=endpoint, method=method
+                )
+                lines.append(f'{metric_name}{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def to_dict(cls) -> dict:
+        stages = {}
+        for (stage, network, endpoint), histogram in sorted(
+            cls.HISTOGRAMS.items()
+        ):
+            networks = stages.setdefault(stage, {})
+            networks.setdefault(network, {})[endpoint or 'any'] = {
+                'count': histogram.count,
+                'average': (
+                    round(histogram.sum / histogram.count, 4)
+                    if histogram.count else 0
+                ),
+                'p50': histogram.get_quantile(0.5),
+                'p95': histogram.get_quantile(0.95),
+                'max': round(histogram.max, 4)
+            }
+
+        rpc_calls = {}
+        for counters, field in (
+            (cls.RPC_CALLS, 'calls'), (cls.RPC_ERRORS, 'errors')
+        ):
+            for (network, endpoint, method), count in counters.items():
+                methods = rpc_calls.setdefault(network, {}).setdefault(
+                    endpoint, {}
+                )
+                methods.setdefault(method, {'calls': 0, 'errors': 0})
+                methods[method][field] = count
+
+        return {'stages': stages, 'rpc_calls': rpc_calls}
+
+    @classmethod
+    def export(cls, folder: str) -> tuple[Path, Path]:
+        """
+        Write the metrics to a Prometheus text file and a JSON summary.
+
+        Args:
+            folder (str): the folder of the files.
+
+        Returns:
+            tuple[Path, Path]: the paths of the Prometheus and JSON files.
+
+        """
+        folder_path = Path(folder)
+        folder_path.mkdir(parents=True, exist_ok=True)
+
+        prometheus_path = folder_path / 'metrics.prom'
+        prometheus_path.write_text(cls.to_prometheus())
+
+        json_path = folder_path / 'metrics.json'
+        json_path.write_text(json.dumps(cls.to_dict(), indent=4))
+
+        return prometheus_path, json_path
@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+from web3 import Web3
+
+
+class BlockTimeModel:
+    """
+    A block time model of one network learned from recent block timestamps.
+    It derives the poll intervals, receipt timeouts and backoff schedules.
+
+    """
+
+    def __init__(
+        self,
+        block_time: int | float = 2,
+        sample_blocks: int = 20,
+        refresh_interval: int | float = 600
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            block_time (int | float): the initial block time in seconds. (2)
+            sample_blocks (int): how many recent blocks to learn from. (20)
+            refresh_interval (int | float): the seconds after which the block
+                time is learned again. (600)
+
+        """
+        self.block_time = block_time
+        self.sample_blocks = sample_blocks
+        self.refresh_interval = refresh_interval
+        self.updated_at: float | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def update(self, w3: Web3) -> float:
+        """
+        Learn the block time from the timestamps of the recent blocks.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+
+        Returns:
+            float: the block time in seconds.
+
+        """
+        latest_block = await w3.eth.get_block('latest')
+        sample_blocks = min(self.sample_blocks, latest_block['number'])
+
+        if sample_blocks > 0:
+            old_block = await w3.eth.get_block(
+                latest_block['number'] - sample_blocks
+            )
+            spent_time = latest_block['timestamp'] - old_block['timestamp']
+            if spent_time > 0:
+                self.block_time = spent_time / sample_blocks
+
+        self.updated_at = time.monotonic()
+
+        return self.block_time
+
+    async def ensure_updated(self, w3: Web3) -> float:
+        """
+        Learn the block time if it has not been learned yet or is stale.
+        An error keeps the previous block time.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+
+        Returns:
+            float: the block time in seconds.
+
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if (
+                self.updated_at is None
+                or time.monotonic() - self.updated_at >= self.refresh_interval
+            ):
+                try:
+                    await self.update(w3)
+                except Exception:
+                    self.updated_at = time.monotonic()
+
+        return self.block_time
+
+    def get_poll_interval(self) -> float:
+        return min(max(self.block_time / 3, 0.1), 5)
+
+    def get_receipt_timeout(
+        self,
+        blocks: int = 30,
+        min_timeout: int | float = 120
+    ) -> float:
+        return max(self.block_time * blocks, min_timeout)
+
+    def get_backoff_schedule(self, attempts: int = 5) -> list[float]:
+        poll_interval = self.get_poll_interval()
+        max_interval = max(self.block_time * 2, poll_interval)
+
+        return [
+            min(poll_interval * 2 ** attempt, max_interval)
+            for attempt in range(attempts)
+        ]
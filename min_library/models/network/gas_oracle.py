@@ -0,0 +1,179 @@
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+from web3 import Web3
+from web3.exceptions import Web3Exception
+
+
+class GasOracle:
+    """
+    A shared gas price cache of one network.
+
+    The values are cached until a new block is seen or the TTL passes,
+    and concurrent requests for the same value share one RPC call. A value
+    fetched before a new block is seen is not cached.
+
+    """
+
+    def __init__(
+        self,
+        ttl: int | float = 3,
+        priority_fee_percentile: int | float = 50,
+        fee_history_blocks: int = 10
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            ttl (int | float): the seconds the values are cached for. (3)
+            priority_fee_percentile (int | float): the reward percentile of
+                the blocks the max priority fee is estimated from. (50)
+            fee_history_blocks (int): how many last blocks the max priority
+                fee is estimated from. (10)
+
+        """
+        self.ttl = ttl
+        self.priority_fee_percentile = priority_fee_percentile
+        self.fee_history_blocks = fee_history_blocks
+        self.block_number: int | None = None
+        self._cache: dict[Any, tuple[Any, float]] = {}
+        self._pending: dict[Any, asyncio.Task] = {}
+        # Bumped on every new block, so a fetch started before the block is
+        # not cached after it
+        self._generation = 0
+
+    def on_new_block(self, block_number: int) -> None:
+        """
+        Drop the cached values if the block is newer than the last seen one.
+
+        Args:
+            block_number (int): the number of the block.
+
+        """
+        if self.block_number is None or block_number > self.block_number:
+            self.block_number = block_number
+            self._generation += 1
+            self._cache.clear()
+            # The fetches in flight go on for their callers only
+            self._pending.clear()
+
+    async def get(
+        self,
+        key: Any,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Get the cached value or fetch it once for all waiting callers.
+
+        Args:
+            key (Any): the key of the value.
+            fetch (Callable[[], Awaitable[Any]]): the coroutine function
+                that fetches the value.
+
+        Returns:
+            Any: the value.
+
+        """
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+
+        if key not in self._pending:
+            generation = self._generation
+            self._pending[key] = asyncio.ensure_future(fetch())
+            self._pending[key].add_done_callback(
+                lambda task: self._on_fetched(key, task, generation)
+            )
+
+        return await asyncio.shield(self._pending[key])
+
+    def _on_fetched(
+        self,
+        key: Any,
+        task: asyncio.Task,
+        generation: int
+    ) -> None:
+        if self._pending.get(key) is task:
+            self._pending.pop(key)
+
+        if generation != self._generation:
+            return
+
+        if not task.cancelled() and task.exception() is None:
+            self._cache[key] = (task.result(), time.monotonic())
+
+    async def get_gas_price(self, w3: Web3) -> int:
+        return await self.get('gas_price', lambda: w3.eth.gas_price)
+
+    async def get_max_priority_fee(self, w3: Web3) -> int:
+        """
+        Get the max priority fee estimated from eth_feeHistory or, if the
+        RPC has no fee history or the last blocks are empty, from
+        eth_maxPriorityFeePerGas, but at least 1 Wei.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+
+        Returns:
+            int: the max priority fee in Wei.
+
+        """
+        try:
+            max_priority_fee = await self.get_priority_fee_from_history(
+                w3=w3,
+                percentile=self.priority_fee_percentile,
+                block_count=self.fee_history_blocks
+            )
+        except (ValueError, Web3Exception):
+            max_priority_fee = None
+
+        if max_priority_fee is not None:
+            return max_priority_fee
+
+        max_priority_fee = await self.get(
+            'max_priority_fee', lambda: w3.eth.max_priority_fee
+        )
+
+        return max(max_priority_fee, 1)
+
+    async def get_priority_fee_from_history(
+        self,
+        w3: Web3,
+        percentile: int | float = 50,
+        block_count: int = 10,
+        newest_block: int | str = 'latest'
+    ) -> int | None:
+        """
+        Estimate the max priority fee as the median of the reward
+        percentile of the last blocks from eth_feeHistory. The empty blocks
+        of a quiet network have a zero reward and are left out, so the fee
+        is never zero.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+            percentile (int | float): the reward percentile of every block. (50)
+            block_count (int): how many blocks to take. (10)
+            newest_block (int | str): the newest block. ('latest')
+
+        Returns:
+            int | None: the max priority fee in Wei, None if the history
+                has no non-zero rewards.
+
+        """
+        async def _fetch() -> int | None:
+            fee_history = await w3.eth.fee_history(
+                block_count, newest_block, [percentile]
+            )
+            rewards = [
+                block_rewards[0]
+                for block_rewards in fee_history.get('reward', [])
+                if block_rewards and block_rewards[0]
+            ]
+
+            return int(statistics.median(rewards)) if rewards else None
+
+        return await self.get(
+            ('fee_history', percentile, block_count, newest_block), _fetch
+        )
@@ -1,10 +1,20 @@
-import random
 import requests
 from typing import List
 
 from web3 import Web3
 
+from min_library.models.network.block_time_model import BlockTimeModel
+from min_library.models.network.gas_oracle import GasOracle
+from min_library.models.network.rpc_pool import RpcPool
 import min_library.models.others.exceptions as exceptions
+from settings.settings import (
+    BLOCK_TIME_REFRESH_INTERVAL,
+    DEFAULT_PRIORITY_FEE_PERCENTILE,
+    FEE_HISTORY_BLOCKS,
+    GAS_ORACLE_TTL,
+    PRIORITY_FEE_PERCENTILES,
+    RPC_HEALTH_CHECK_INTERVAL
+)
 
 
 class Network:
@@ -21,9 +31,26 @@ class Network:
         coin_symbol: str | None = None,
         decimals: int | None = None,
         explorer: str | None = None,
+        block_time: int | float = 2,
+        ws_rpc: str | None = None,
     ) -> None:
         self.name: str = name.lower()
-        self.rpc: str = rpc if isinstance(rpc, str) else random.choice(rpc)
+        self.rpc_pool: RpcPool = RpcPool(
+            urls=[rpc] if isinstance(rpc, str) else rpc,
+            health_check_interval=RPC_HEALTH_CHECK_INTERVAL
+        )
+        self.ws_rpc: str | None = ws_rpc
+        self.gas_oracle: GasOracle = GasOracle(
+            ttl=GAS_ORACLE_TTL,
+            priority_fee_percentile=PRIORITY_FEE_PERCENTILES.get(
+                self.name, DEFAULT_PRIORITY_FEE_PERCENTILE
+            ),
+            fee_history_blocks=FEE_HISTORY_BLOCKS
+        )
+        self.block_time_model: BlockTimeModel = BlockTimeModel(
+            block_time=block_time,
+            refresh_interval=BLOCK_TIME_REFRESH_INTERVAL
+        )
         self.chain_id: int | None = chain_id
         self.tx_type: int = tx_type
         self.coin_symbol: str | None = coin_symbol
@@ -34,6 +61,10 @@ class Network:
         self._initialize_coin_symbol_and_decimals()
         self._coin_symbol_to_upper()
 
+    @property
+    def rpc(self) -> str:
+        return self.rpc_pool.get_best()
+
     def _initialize_chain_id(self):
         if self.chain_id:
             return
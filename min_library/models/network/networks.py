@@ -15,6 +15,8 @@ class Networks(metaclass=Singleton):
         coin_symbol=TokenSymbol.ETH,
         decimals=18,
         explorer='https://etherscan.io',
+        block_time=12,
+        ws_rpc='wss://ethereum-rpc.publicnode.com',
     )
 
     Arbitrum = Network(
@@ -27,7 +29,9 @@ class Networks(metaclass=Singleton):
         tx_type=2,
         coin_symbol=TokenSymbol.ETH,
         decimals=18,
-        explorer='https://arbiscan.io'
+        explorer='https://arbiscan.io',
+        block_time=0.25,
+        ws_rpc='wss://arbitrum-one-rpc.publicnode.com',
     )
     
     Bsc = Network(
@@ -37,7 +41,9 @@ class Networks(metaclass=Singleton):
         tx_type=0,
         coin_symbol=TokenSymbol.BNB,
         decimals=18,
-        explorer='https://bscscan.com'
+        explorer='https://bscscan.com',
+        block_time=3,
+        ws_rpc='wss://bsc-rpc.publicnode.com',
     )
 
     Optimism = Network(
@@ -48,6 +54,8 @@ class Networks(metaclass=Singleton):
         coin_symbol=TokenSymbol.ETH,
         decimals=18,
         explorer='https://optimistic.etherscan.io',
+        block_time=2,
+        ws_rpc='wss://optimism-rpc.publicnode.com',
     )
     
     Op_bnb = Network(
@@ -63,6 +71,8 @@ class Networks(metaclass=Singleton):
         coin_symbol=TokenSymbol.BNB,
         decimals=18,
         explorer="https://mainnet.opbnbscan.com",
+        block_time=1,
+        ws_rpc="wss://opbnb-rpc.publicnode.com",
     )
     
     Polygon = Network(
@@ -73,6 +83,8 @@ class Networks(metaclass=Singleton):
         coin_symbol=TokenSymbol.MATIC,
         decimals=18,
         explorer='https://polygonscan.com',
+        block_time=2,
+        ws_rpc='wss://polygon-bor-rpc.publicnode.com',
     )
 
     @classmethod
@@ -0,0 +1,193 @@
+import asyncio
+import json
+from typing import Callable
+
+import websockets
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.network.network import Network
+from settings.settings import IS_WS_NEW_HEADS
+
+
+class NewHeadsListener:
+    """
+    A persistent WebSocket connection of one network subscribed to
+    `newHeads`, so that block progress is pushed instead of polled.
+
+    Until the connection is up, `is_connected` is False and the callers
+    fall back to HTTP polling. A lost connection is retried with an
+    exponential backoff, after `max_failures` failed attempts in a row the
+    listener gives up and the network is polled until the end of the run.
+
+    """
+    LISTENERS: dict[str, 'NewHeadsListener'] = {}
+
+    def __init__(
+        self,
+        network: Network,
+        ws_rpc: str,
+        reconnect_delay: int | float = 5,
+        max_reconnect_delay: int | float = 300,
+        max_failures: int = 6
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            network (Network): the network.
+            ws_rpc (str): the WebSocket RPC url.
+            reconnect_delay (int | float): the seconds before the first
+                reconnection, doubled after every failed one. (5)
+            max_reconnect_delay (int | float): the most seconds between two
+                connection attempts. (300)
+            max_failures (int): the failed attempts in a row after which
+                the listener gives up. (6)
+
+        """
+        self.network = network
+        self.ws_rpc = ws_rpc
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_failures = max_failures
+        self.block_number: int | None = None
+        self.is_connected = False
+        self.is_given_up = False
+        self.callbacks: list[Callable[[int], None]] = [
+            network.gas_oracle.on_new_block
+        ]
+        self._head_event: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def start_for(cls, network: Network) -> 'NewHeadsListener | None':
+        """
+        Get the running listener of the network, starting it if needed.
+        Must be called inside the running event loop.
+
+        Args:
+            network (Network): the network.
+
+        Returns:
+            NewHeadsListener | None: the listener or None if the network
+                has no WebSocket RPC, WebSockets are off or the listener
+                has given up.
+
+        """
+        if not IS_WS_NEW_HEADS or not network.ws_rpc:
+            return None
+
+        if network.name not in cls.LISTENERS:
+            cls.LISTENERS[network.name] = NewHeadsListener(
+                network=network, ws_rpc=network.ws_rpc
+            )
+
+        listener = cls.LISTENERS[network.name]
+        if listener.is_given_up:
+            return None
+
+        if not listener._task or listener._task.done():
+            listener._task = asyncio.create_task(listener._run())
+
+        return listener
+
+    async def wait_for_new_head(self, timeout: int | float) -> int | None:
+        """
+        Wait for the next block pushed by the node.
+
+        Args:
+            timeout (int | float): the seconds to wait.
+
+        Returns:
+            int | None: the number of the block or None on timeout.
+
+        """
+        if self._head_event is None:
+            self._head_event = asyncio.Event()
+
+        head_event = self._head_event
+        try:
+            await asyncio.wait_for(head_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        return self.block_number
+
+    def _on_new_head(self, head: dict) -> None:
+        block_number = int(head['number'], 16)
+        if self.block_number is not None and block_number <= self.block_number:
+            return
+
+        self.block_number = block_number
+        for callback in self.callbacks:
+            callback(block_number)
+
+        if self._head_event:
+            self._head_event.set()
+        self._head_event = asyncio.Event()
+
+    async def _listen(self) -> None:
+        async with websockets.connect(self.ws_rpc) as websocket:
+            await websocket.send(json.dumps({
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'eth_subscribe',
+                'params': ['newHeads']
+            }))
+            response = json.loads(await websocket.recv())
+            if 'error' in response:
+                raise ConnectionError(response['error'])
+
+            self.is_connected = True
+            async for message in websocket:
+                data = json.loads(message)
+                if data.get('method') == 'eth_subscription':
+                    self._on_new_head(data['params']['result'])
+
+    async def _run(self) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+        failures_count = 0
+
+        while True:
+            try:
+                await self._listen()
+                error = 'the connection is closed'
+            except asyncio.CancelledError:
+                self.is_connected = False
+                raise
+            except Exception as e:
+                error = e
+
+            # The connection was up, so this is a new outage
+            if self.is_connected:
+                failures_count = 0
+            self.is_connected = False
+            failures_count += 1
+
+            if failures_count >= self.max_failures:
+                self.is_given_up = True
+                logger.warning(
+                    f"{self.network.name} | WebSocket failed "
+                    f"{failures_count} times, using HTTP until the end of "
+                    f"the run: {error}"
+                )
+                return
+
+            if failures_count == 1:
+                logger.warning(
+                    f"{self.network.name} | WebSocket is unavailable, "
+                    f"using HTTP while reconnecting: {error}"
+                )
+
+            await asyncio.sleep(min(
+                self.reconnect_delay * 2 ** (failures_count - 1),
+                self.max_reconnect_delay
+            ))
+
+    @classmethod
+    def stop_all(cls) -> None:
+        for listener in cls.LISTENERS.values():
+            if listener._task and not listener._task.done():
+                listener._task.cancel()
+
+            listener._task = None
+            listener.is_connected = False
@@ -0,0 +1,524 @@
+import asyncio
+import json
+import time
+from typing import Any
+
+from aiohttp import (
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig
+)
+from eth_utils import keccak
+from fake_useragent import UserAgent
+from web3 import Web3
+from web3.eth import AsyncEth
+from web3.middleware import async_geth_poa_middleware
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.metrics.metrics import Metrics
+from min_library.models.network.network import Network
+from min_library.models.network.rpc_pool import RpcPool
+from settings.settings import (
+    CONNECTOR_LIMIT,
+    CONNECTOR_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    IS_BROADCAST_TO_ALL_RPCS,
+    KEEPALIVE_TIMEOUT
+)
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    An async HTTP provider that sends requests through the keep-alive
+    sessions of the ProviderRegistry to the fastest healthy RPC of the pool
+    and fails over to the next RPC on timeouts and 5xx responses.
+
+    A raw transaction that failed over after a timeout or 5xx may have been
+    accepted by the previous RPC, so "already known" of the next RPC means
+    it was sent and its hash is returned. So does "nonce too low" if the
+    transaction is in the mempool or the chain, otherwise the nonce is
+    stale and the error is returned.
+
+    If IS_BROADCAST_TO_ALL_RPCS is on, raw transactions are sent to every
+    RPC of the pool at once instead, so a node that is slow to propagate
+    doesn't delay the inclusion.
+
+    """
+    ALREADY_KNOWN_ERRORS = (
+        'already known',
+        'known transaction',
+        'already imported',
+    )
+    NONCE_TOO_LOW_ERRORS = (
+        'nonce too low',
+    )
+
+    def __init__(
+        self,
+        rpc_pool: RpcPool,
+        proxy: str | None = None,
+        headers: dict | None = None,
+        network_name: str = 'unknown'
+    ) -> None:
+        self.rpc_pool = rpc_pool
+        self.network_name = network_name
+        self.proxy = proxy
+        self._broadcast_tasks: set[asyncio.Task] = set()
+        self.is_batch_supported = True
+        request_kwargs = {'proxy': proxy}
+        if headers:
+            request_kwargs['headers'] = headers
+
+        super().__init__(
+            endpoint_uri=rpc_pool.get_best(), request_kwargs=request_kwargs
+        )
+
+    @staticmethod
+    def _is_failover_error(error: Exception) -> bool:
+        if isinstance(error, ClientResponseError):
+            return error.status >= 500 or error.status == 429
+
+        return isinstance(error, (asyncio.TimeoutError, ClientError))
+
+    @classmethod
+    def is_already_known_error(cls, error: Exception | dict | str) -> bool:
+        if isinstance(error, dict):
+            error = error.get('message', '')
+        message = str(error).lower()
+
+        return any(text in message for text in cls.ALREADY_KNOWN_ERRORS)
+
+    @classmethod
+    def is_nonce_too_low_error(cls, error: Exception | dict | str) -> bool:
+        if isinstance(error, dict):
+            error = error.get('message', '')
+        message = str(error).lower()
+
+        return any(text in message for text in cls.NONCE_TOO_LOW_ERRORS)
+
+    async def _post_with_failover(
+        self,
+        request_data: bytes,
+        methods: list[str]
+    ) -> tuple[bytes, int]:
+        request_kwargs = self.get_request_kwargs()
+        self.rpc_pool.ensure_health_checks(
+            lambda url, data: ProviderRegistry.post(url, data, **request_kwargs)
+        )
+
+        last_error = None
+        failovers_count = 0
+        for endpoint in self.rpc_pool.get_ordered():
+            started_at = time.monotonic()
+            try:
+                raw_response = await ProviderRegistry.post(
+                    endpoint.url, request_data, **request_kwargs
+                )
+            except Exception as e:
+                Metrics.count_rpc_call(
+                    self.network_name, endpoint.url, methods, is_error=True
+                )
+                if not self._is_failover_error(e):
+                    raise
+                self.rpc_pool.record_failure(endpoint.url)
+                last_error = e
+                failovers_count += 1
+                continue
+
+            Metrics.count_rpc_call(self.network_name, endpoint.url, methods)
+            self.rpc_pool.record_success(
+                endpoint.url, time.monotonic() - started_at
+            )
+            self.endpoint_uri = endpoint.url
+
+            return raw_response, failovers_count
+
+        raise last_error
+
+    async def _send_to_endpoint(
+        self,
+        url: str,
+        request_data: bytes,
+        accepted_urls: list[str]
+    ) -> RPCResponse | Exception:
+        started_at = time.monotonic()
+        try:
+            raw_response = await ProviderRegistry.post(
+                url, request_data, **self.get_request_kwargs()
+            )
+            response = self.decode_rpc_response(raw_response)
+        except Exception as e:
+            Metrics.count_rpc_call(
+                self.network_name, url, ['eth_sendRawTransaction'],
+                is_error=True
+            )
+            self.rpc_pool.record_failure(url)
+            return e
+
+        Metrics.count_rpc_call(
+            self.network_name, url, ['eth_sendRawTransaction']
+        )
+        if 'error' in response and not self.is_already_known_error(
+            response['error']
+        ):
+            return response
+
+        self.rpc_pool.record_broadcast(
+            url, time.monotonic() - started_at, is_first=not accepted_urls
+        )
+        if not accepted_urls:
+            self.endpoint_uri = url
+        accepted_urls.append(url)
+
+        return response
+
+    @staticmethod
+    def _get_hash_response(
+        response: RPCResponse,
+        raw_transaction: str
+    ) -> RPCResponse:
+        # "already known" has no hash, so it's computed locally
+        return {
+            'jsonrpc': '2.0',
+            'id': response.get('id'),
+            'result': '0x' + keccak(hexstr=raw_transaction).hex()
+        }
+
+    async def _send_raw_transaction(
+        self,
+        request_data: bytes,
+        raw_transaction: str
+    ) -> RPCResponse:
+        raw_response, failovers_count = await self._post_with_failover(
+            request_data, ['eth_sendRawTransaction']
+        )
+        response = self.decode_rpc_response(raw_response)
+
+        error = response.get('error')
+        if error and self.is_already_known_error(error):
+            return self._get_hash_response(response, raw_transaction)
+
+        if error and failovers_count and self.is_nonce_too_low_error(error):
+            hash_response = self._get_hash_response(response, raw_transaction)
+            # Sent only if the previous RPC took it, not for a stale nonce
+            if await self._is_tx_known(hash_response['result']):
+                return hash_response
+
+        return response
+
+    async def _is_tx_known(self, tx_hash: str) -> bool:
+        for method in ('eth_getTransactionByHash', 'eth_getTransactionReceipt'):
+            try:
+                response = await self.make_request(method, [tx_hash])
+            except Exception:
+                continue
+
+            if response.get('result'):
+                return True
+
+        return False
+
+    async def _broadcast(
+        self,
+        request_data: bytes,
+        raw_transaction: str
+    ) -> RPCResponse:
+        """
+        Send the raw transaction to every RPC of the pool at once and return
+        as soon as one of them accepts it. The other sends go on in the
+        background to rank the endpoints by their acceptance latency.
+
+        Args:
+            request_data (bytes): the eth_sendRawTransaction request.
+            raw_transaction (str): the raw transaction.
+
+        Returns:
+            RPCResponse: the response with the transaction hash or, if no RPC
+                accepted the transaction, the first error response.
+
+        """
+        accepted_urls = []
+        tasks = [
+            asyncio.create_task(
+                self._send_to_endpoint(url, request_data, accepted_urls)
+            )
+            for url in self.rpc_pool.urls
+        ]
+        self._broadcast_tasks.update(tasks)
+        for task in tasks:
+            task.add_done_callback(self._broadcast_tasks.discard)
+
+        error_response = None
+        last_error = None
+        for next_task in asyncio.as_completed(tasks):
+            response = await next_task
+
+            if isinstance(response, Exception):
+                last_error = response
+            elif 'error' not in response or self.is_already_known_error(
+                response['error']
+            ):
+                return self._get_hash_response(response, raw_transaction)
+            elif error_response is None:
+                error_response = response
+
+        if error_response is None:
+            raise last_error
+
+        return error_response
+
+    async def make_request(
+        self,
+        method: RPCEndpoint,
+        params: Any
+    ) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+
+        if (
+            IS_BROADCAST_TO_ALL_RPCS
+            and method == 'eth_sendRawTransaction'
+            and len(self.rpc_pool.urls) > 1
+        ):
+            return await self._broadcast(request_data, params[0])
+
+        if method == 'eth_sendRawTransaction':
+            return await self._send_raw_transaction(request_data, params[0])
+
+        raw_response, _ = await self._post_with_failover(
+            request_data, [method]
+        )
+
+        return self.decode_rpc_response(raw_response)
+
+    async def make_batch_request(
+        self,
+        requests: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse]:
+        """
+        Send several requests in one JSON-RPC batch. If the RPC rejects the
+        batch, the requests are sent one by one, now and later.
+
+        Args:
+            requests (list[tuple[RPCEndpoint, Any]]): the (method, params)
+                pairs.
+
+        Returns:
+            list[RPCResponse]: the raw responses in order of the requests.
+
+        """
+        if not requests:
+            return []
+
+        if not self.is_batch_supported:
+            return await self._make_separate_requests(requests)
+
+        request_ids = [next(self.request_counter) for _ in requests]
+        request_data = json.dumps([
+            {
+                'jsonrpc': '2.0',
+                'method': method,
+                'params': params,
+                'id': request_id
+            }
+            for request_id, (method, params) in zip(request_ids, requests)
+        ]).encode()
+
+        raw_response, _ = await self._post_with_failover(
+            request_data, [method for method, _ in requests]
+        )
+        batch_response = json.loads(raw_response)
+
+        # An RPC without batches answers with a single error object
+        if not isinstance(batch_response, list):
+            ConsoleLoggerSingleton.get_logger().warning(
+                f"{self.network_name} | {self.endpoint_uri} rejected a batch, "
+                f"the requests are sent one by one: "
+                f"{batch_response.get('error')}"
+            )
+            self.is_batch_supported = False
+            return await self._make_separate_requests(requests)
+
+        responses = {
+            response.get('id'): response
+            for response in batch_response
+        }
+
+        return [responses.get(request_id, {}) for request_id in request_ids]
+
+    async def _make_separate_requests(
+        self,
+        requests: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse]:
+        return list(await asyncio.gather(*[
+            self.make_request(method, params) for method, params in requests
+        ]))
+
+
+class ProviderRegistry:
+    """
+    A process-wide registry of Web3 instances keyed by (network, proxy) and
+    aiohttp sessions keyed by (rpc url, proxy), so every account borrows a
+    keep-alive connection pool instead of opening its own one.
+
+    The accounts of one instance share its headers, a random User-Agent is
+    chosen per instance, so per network and proxy, not per account.
+
+    """
+    REQUEST_TIMEOUT: int = 10
+    WEB3S: dict[tuple[str, str | None], Web3] = {}
+    SESSIONS: dict[tuple[str, str | None], ClientSession] = {}
+    STATS: dict[str, int] = {
+        'requests': 0,
+        'handshakes': 0,
+        'reused_connections': 0
+    }
+
+    @classmethod
+    def get_web3(
+        cls,
+        network: Network,
+        proxy: str | None = None
+    ) -> Web3:
+        """
+        Get the shared Web3 instance for the network and proxy.
+
+        Args:
+            network (Network): the network.
+            proxy (str | None): the proxy url. (None)
+
+        Returns:
+            Web3: the Web3 instance.
+
+        """
+        key = (network.name, proxy)
+
+        if key not in cls.WEB3S:
+            w3 = Web3(
+                PooledHTTPProvider(
+                    rpc_pool=network.rpc_pool,
+                    proxy=proxy,
+                    headers=cls.get_headers(),
+                    network_name=network.name
+                ),
+                modules={'eth': (AsyncEth,)},
+                middlewares=[]
+            )
+            w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+            cls.WEB3S[key] = w3
+
+        return cls.WEB3S[key]
+
+    @staticmethod
+    def get_headers() -> dict[str, str]:
+        return {
+            'Accept': '*/*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Content-Type': 'application/json',
+            'User-Agent': UserAgent().random
+        }
+
+    @classmethod
+    def _create_trace_config(cls) -> TraceConfig:
+        async def on_request_start(session, context, params):
+            cls.STATS['requests'] += 1
+
+        async def on_connection_create_end(session, context, params):
+            cls.STATS['handshakes'] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            cls.STATS['reused_connections'] += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        return trace_config
+
+    @classmethod
+    def get_session(
+        cls,
+        rpc: str,
+        proxy: str | None = None
+    ) -> ClientSession:
+        """
+        Get the keep-alive session for the RPC and proxy. Must be called
+        inside the running event loop.
+
+        Args:
+            rpc (str): the RPC url.
+            proxy (str | None): the proxy url. (None)
+
+        Returns:
+            ClientSession: the session.
+
+        """
+        key = (rpc, proxy)
+        session = cls.SESSIONS.get(key)
+
+        if session is None or session.closed:
+            connector = TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            session = ClientSession(
+                connector=connector,
+                timeout=ClientTimeout(total=cls.REQUEST_TIMEOUT),
+                trace_configs=[cls._create_trace_config()]
+            )
+            cls.SESSIONS[key] = session
+
+        return session
+
+    @classmethod
+    async def post(
+        cls,
+        rpc: str,
+        data: bytes,
+        **kwargs: Any
+    ) -> bytes:
+        session = cls.get_session(rpc, kwargs.get('proxy'))
+
+        async with session.post(rpc, data=data, **kwargs) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    @classmethod
+    def report(cls) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+        logger.info(
+            f"RPC connections: {cls.STATS['requests']} requests, "
+            f"{cls.STATS['handshakes']} handshakes, "
+            f"{cls.STATS['reused_connections']} reused connections"
+        )
+
+        rpc_pools = {
+            network_name: w3.provider.rpc_pool
+            for (network_name, _), w3 in cls.WEB3S.items()
+        }
+        for network_name, rpc_pool in rpc_pools.items():
+            for endpoint in rpc_pool.get_ranked_by_broadcast():
+                logger.info(
+                    f"Broadcast {network_name} | {endpoint.url}: "
+                    f"{endpoint.broadcasts_accepted} accepted, "
+                    f"{endpoint.broadcasts_first} first, "
+                    f"average {round(endpoint.broadcast_latency, 3)} secs"
+                )
+
+    @classmethod
+    async def close(cls) -> None:
+        for w3 in cls.WEB3S.values():
+            w3.provider.rpc_pool.stop_health_checks()
+
+        for session in cls.SESSIONS.values():
+            if not session.closed:
+                await session.close()
+
+        cls.SESSIONS.clear()
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable
+
+from min_library.models.others.common import AutoRepr
+
+
+class RpcEndpoint(AutoRepr):
+    """
+    An RPC endpoint of the pool.
+
+    Attributes:
+        url (str): the RPC url.
+        latency (float | None): the moving-average latency in seconds.
+        is_healthy (bool): whether the endpoint answers.
+        failures (int): the count of failed requests in a row.
+        broadcast_latency (float | None): the moving-average seconds the
+            endpoint takes to accept a broadcast transaction.
+        broadcasts_accepted (int): the count of accepted broadcasts.
+        broadcasts_first (int): the count of broadcasts the endpoint was
+            the first to accept.
+
+    """
+    url: str
+    latency: float | None
+    is_healthy: bool
+    failures: int
+    broadcast_latency: float | None
+    broadcasts_accepted: int
+    broadcasts_first: int
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.latency = None
+        self.is_healthy = True
+        self.failures = 0
+        self.broadcast_latency = None
+        self.broadcasts_accepted = 0
+        self.broadcasts_first = 0
+
+
+class RpcPool:
+    """
+    A pool of RPC endpoints of one network, ordered by health and
+    moving-average latency.
+
+    """
+    HEALTH_CHECK_DATA: bytes = json.dumps({
+        'jsonrpc': '2.0', 'method': 'eth_blockNumber', 'params': [], 'id': 0
+    }).encode()
+
+    def __init__(
+        self,
+        urls: list[str],
+        health_check_interval: int | float = 30,
+        latency_weight: float = 0.3,
+        max_failures: int = 2
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            urls (list[str]): the RPC urls.
+            health_check_interval (int | float): the seconds between two
+                health checks. (30)
+            latency_weight (float): the weight of a new latency sample in
+                the moving average. (0.3)
+            max_failures (int): the failed requests in a row after which the
+                endpoint is unhealthy. (2)
+
+        """
+        self.endpoints = {url: RpcEndpoint(url) for url in urls}
+        self.health_check_interval = health_check_interval
+        self.latency_weight = latency_weight
+        self.max_failures = max_failures
+        self._health_check_task: asyncio.Task | None = None
+
+    @property
+    def urls(self) -> list[str]:
+        return list(self.endpoints)
+
+    def get_ordered(self) -> list[RpcEndpoint]:
+        """
+        Get the endpoints: healthy ones first, the fastest first, the ones
+        not measured yet after the measured ones in the configured order.
+
+        Returns:
+            list[RpcEndpoint]: the ordered endpoints.
+
+        """
+        return sorted(
+            self.endpoints.values(),
+            key=lambda endpoint: (
+                not endpoint.is_healthy,
+                endpoint.latency is None,
+                endpoint.latency or 0.0
+            )
+        )
+
+    def get_best(self) -> str:
+        return self.get_ordered()[0].url
+
+    def get_ranked_by_broadcast(self) -> list[RpcEndpoint]:
+        """
+        Get the endpoints that accepted broadcasts, the fastest first.
+
+        Returns:
+            list[RpcEndpoint]: the ranked endpoints.
+
+        """
+        return sorted(
+            (
+                endpoint for endpoint in self.endpoints.values()
+                if endpoint.broadcast_latency is not None
+            ),
+            key=lambda endpoint: endpoint.broadcast_latency
+        )
+
+    def _get_average(self, average: float | None, latency: float) -> float:
+        if average is None:
+            return latency
+
+        return (
+            self.latency_weight * latency
+            + (1 - self.latency_weight) * average
+        )
+
+    def record_success(self, url: str, latency: float) -> None:
+        endpoint = self.endpoints[url]
+        endpoint.latency = self._get_average(endpoint.latency, latency)
+        endpoint.failures = 0
+        endpoint.is_healthy = True
+
+    def record_broadcast(
+        self,
+        url: str,
+        latency: float,
+        is_first: bool = False
+    ) -> None:
+        endpoint = self.endpoints[url]
+        endpoint.broadcast_latency = self._get_average(
+            endpoint.broadcast_latency, latency
+        )
+        endpoint.broadcasts_accepted += 1
+        if is_first:
+            endpoint.broadcasts_first += 1
+
+    def record_failure(self, url: str) -> None:
+        endpoint = self.endpoints[url]
+        endpoint.failures += 1
+
+        if endpoint.failures >= self.max_failures:
+            endpoint.is_healthy = False
+
+    async def check_health(
+        self,
+        post: Callable[[str, bytes], Awaitable[bytes]]
+    ) -> None:
+        async def _check(url: str) -> None:
+            started_at = time.monotonic()
+            try:
+                response = json.loads(await post(url, self.HEALTH_CHECK_DATA))
+                # A JSON-RPC error comes with HTTP 200 too
+                if 'result' not in response:
+                    raise ValueError(response.get('error'))
+            except Exception:
+                self.record_failure(url)
+                return
+
+            self.record_success(url, time.monotonic() - started_at)
+
+        await asyncio.gather(*[_check(url) for url in self.endpoints])
+
+    async def _run_health_checks(
+        self,
+        post: Callable[[str, bytes], Awaitable[bytes]]
+    ) -> None:
+        while True:
+            await self.check_health(post)
+            await asyncio.sleep(self.health_check_interval)
+
+    def ensure_health_checks(
+        self,
+        post: Callable[[str, bytes], Awaitable[bytes]]
+    ) -> None:
+        """
+        Start the background health checks if the pool has a choice of
+        endpoints and the checks are not running yet. Must be called inside
+        the running event loop.
+
+        Args:
+            post (Callable[[str, bytes], Awaitable[bytes]]): the coroutine
+                function that posts the request data to the url.
+
+        """
+        if len(self.endpoints) < 2:
+            return
+
+        if self._health_check_task and not self._health_check_task.done():
+            return
+
+        self._health_check_task = asyncio.create_task(
+            self._run_health_checks(post)
+        )
+
+    def stop_health_checks(self) -> None:
+        if self._health_check_task and not self._health_check_task.done():
+            self._health_check_task.cancel()
+
+        self._health_check_task = None
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from settings.settings import CHECKSUM_ADDRESSES_CACHE_SIZE
+
+
+class ChecksumAddresses:
+    """
+    Interned checksum addresses.
+
+    `Web3.to_checksum_address` computes keccak on every call, so the
+    checksum address is computed once per address and kept in a bounded
+    LRU cache. The same address in any case gets the same canonical object.
+
+    """
+    MAX_SIZE: int = CHECKSUM_ADDRESSES_CACHE_SIZE
+    ADDRESSES: OrderedDict[str, ChecksumAddress] = OrderedDict()
+    STATS: dict[str, int] = {
+        'hits': 0,
+        'misses': 0
+    }
+
+    @staticmethod
+    def _get_key(address: str | bytes) -> str:
+        if isinstance(address, (bytes, bytearray)):
+            return address.hex().lower().removeprefix('0x')
+
+        return address.lower().removeprefix('0x')
+
+    @classmethod
+    def get(cls, address: str | bytes) -> ChecksumAddress:
+        """
+        Get the canonical checksum address.
+
+        Args:
+            address (str | bytes): the address in any case or its bytes.
+
+        Returns:
+            ChecksumAddress: the checksum address.
+
+        """
+        key = cls._get_key(address)
+        checksum_address = cls.ADDRESSES.get(key)
+
+        if checksum_address is not None:
+            cls.STATS['hits'] += 1
+            cls.ADDRESSES.move_to_end(key)
+            return checksum_address
+
+        cls.STATS['misses'] += 1
+        return cls.add(Web3.to_checksum_address(address))
+
+    @classmethod
+    def add(cls, checksum_address: ChecksumAddress) -> ChecksumAddress:
+        """
+        Keep the address that is known to be checksummed already, for
+        example the address of an account.
+
+        Args:
+            checksum_address (ChecksumAddress): the checksum address.
+
+        Returns:
+            ChecksumAddress: the canonical checksum address.
+
+        """
+        key = cls._get_key(checksum_address)
+        checksum_address = cls.ADDRESSES.setdefault(key, checksum_address)
+        cls.ADDRESSES.move_to_end(key)
+
+        while len(cls.ADDRESSES) > cls.MAX_SIZE:
+            cls.ADDRESSES.popitem(last=False)
+
+        return checksum_address
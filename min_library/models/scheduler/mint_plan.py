@@ -0,0 +1,258 @@
+import heapq
+import json
+import random
+from collections import defaultdict
+from typing import Optional
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.network.networks import Networks
+from settings.settings import (
+    DEFAULT_TIMELINE_NETWORK_SPACING,
+    IS_PARALLEL_NETWORKS,
+    IS_SLEEP,
+    IS_TIMELINE_SCHEDULER,
+    SLEEP_BETWEEN_ACCS_FROM,
+    SLEEP_BETWEEN_ACCS_TO,
+    SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO,
+    SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM,
+    TIMELINE_NETWORK_SPACINGS,
+    WORKERS_COUNT
+)
+
+# A job of the plan: the account name or ID and the network name
+PlannedJob = tuple[str | int, str]
+
+
+class MintPlan:
+    """
+    A concrete list of the mint jobs of a run, compiled from the network
+    options of MINT_NETWORKS with a seed: the same seed, accounts and
+    options give the same plan.
+
+    The plan is known before the run starts, so it can be checked, grouped
+    by network and estimated in advance, and saved to a file to be run
+    again. The file has the account names and networks only, no private
+    keys.
+
+    """
+    # The blocks a mint takes from the first request to the receipt
+    JOB_BLOCKS: int = 3
+
+    def __init__(
+        self,
+        jobs: list[PlannedJob],
+        seed: int | None = None,
+        nft_name: str | None = None
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            jobs (list[PlannedJob]): the (account, network) jobs in order.
+            seed (int | None): the seed the plan was compiled with. (None)
+            nft_name (str | None): the name of the NFT to mint. (None)
+
+        """
+        self.jobs = jobs
+        self.seed = seed
+        self.nft_name = nft_name
+
+    @staticmethod
+    def choose_network_names(
+        options: list[list[Optional[str]]],
+        rng: random.Random
+    ) -> list[str]:
+        """
+        Choose the networks of one account: the options are shuffled and a
+        network (or nothing, for None) is chosen from every option.
+
+        Args:
+            options (list[list[Optional[str]]]): the network options.
+            rng (random.Random): the random generator.
+
+        Returns:
+            list[str]: the network names in order of the mints.
+
+        """
+        options = options.copy()
+        rng.shuffle(options)
+
+        network_names = []
+        for option in options:
+            network_name = rng.choice(option)
+            if network_name is not None:
+                network_names.append(network_name)
+
+        return network_names
+
+    @classmethod
+    def compile(
+        cls,
+        account_ids: list[str | int],
+        options: list[list[Optional[str]]],
+        seed: int | None = None,
+        is_shuffle_accounts: bool = False,
+        nft_name: str | None = None
+    ) -> 'MintPlan':
+        """
+        Expand the accounts and the network options into the jobs.
+
+        Args:
+            account_ids (list[str | int]): the account names or IDs.
+            options (list[list[Optional[str]]]): the network options.
+            seed (int | None): the seed. (a random one)
+            is_shuffle_accounts (bool): shuffle the accounts order. (False)
+            nft_name (str | None): the name of the NFT to mint. (None)
+
+        Returns:
+            MintPlan: the plan.
+
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        rng = random.Random(seed)
+
+        account_ids = list(account_ids)
+        if is_shuffle_accounts:
+            rng.shuffle(account_ids)
+
+        jobs = [
+            (account_id, network_name)
+            for account_id in account_ids
+            for network_name in cls.choose_network_names(options, rng)
+        ]
+
+        return cls(jobs=jobs, seed=seed, nft_name=nft_name)
+
+    def get_networks_by_account(self) -> dict[str | int, list[str]]:
+        networks_by_account = defaultdict(list)
+        for account_id, network_name in self.jobs:
+            networks_by_account[account_id].append(network_name)
+
+        return dict(networks_by_account)
+
+    def get_accounts_by_network(self) -> dict[str, list[str | int]]:
+        accounts_by_network = defaultdict(list)
+        for account_id, network_name in self.jobs:
+            accounts_by_network[network_name].append(account_id)
+
+        return dict(accounts_by_network)
+
+    def export(self, path: str) -> None:
+        """
+        Save the plan to a JSON file.
+
+        Args:
+            path (str): the path of the file.
+
+        """
+        with open(path, 'w') as file:
+            json.dump({
+                'seed': self.seed,
+                'nft': self.nft_name,
+                'estimated_duration': round(self.estimate_duration()),
+                'jobs': [
+                    {'account': account_id, 'network': network_name}
+                    for account_id, network_name in self.jobs
+                ]
+            }, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'MintPlan':
+        """
+        Load the plan from a JSON file saved by `export`.
+
+        Args:
+            path (str): the path of the file.
+
+        Returns:
+            MintPlan: the plan.
+
+        """
+        with open(path) as file:
+            data = json.load(file)
+
+        return cls(
+            jobs=[(job['account'], job['network']) for job in data['jobs']],
+            seed=data.get('seed'),
+            nft_name=data.get('nft')
+        )
+
+    def get_job_seconds(self, network_name: str) -> float:
+        network = Networks.get_network(network_name=network_name)
+
+        return network.block_time_model.block_time * self.JOB_BLOCKS
+
+    def estimate_duration(self) -> float:
+        """
+        Estimate the run time of the plan with the average sleeps, the way
+        the configured runner (the timeline scheduler or the workers) goes
+        through the jobs.
+
+        Returns:
+            float: the seconds.
+
+        """
+        account_sleep = (
+            SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM
+            + SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO
+        ) / 2 if IS_SLEEP else 0
+        accounts_sleep = (
+            SLEEP_BETWEEN_ACCS_FROM + SLEEP_BETWEEN_ACCS_TO
+        ) / 2 if IS_SLEEP else 0
+
+        if IS_TIMELINE_SCHEDULER:
+            account_timelines = {}
+            network_timelines = {}
+            duration = 0.0
+            for account_id, network_name in self.jobs:
+                network_sleep = sum(TIMELINE_NETWORK_SPACINGS.get(
+                    network_name, DEFAULT_TIMELINE_NETWORK_SPACING
+                )) / 2 if IS_SLEEP else 0
+                start_at = max(
+                    account_timelines.get(account_id, -account_sleep)
+                    + account_sleep,
+                    network_timelines.get(network_name, -network_sleep)
+                    + network_sleep
+                )
+                account_timelines[account_id] = start_at
+                network_timelines[network_name] = start_at
+                duration = max(
+                    duration, start_at + self.get_job_seconds(network_name)
+                )
+
+            return duration
+
+        # The workers take the accounts in order, each one when it is free
+        workers = [0.0] * max(1, WORKERS_COUNT)
+        for network_names in self.get_networks_by_account().values():
+            jobs_seconds = [
+                self.get_job_seconds(network_name)
+                for network_name in network_names
+            ]
+            if IS_PARALLEL_NETWORKS:
+                account_seconds = max(jobs_seconds)
+            else:
+                account_seconds = (
+                    sum(jobs_seconds) + account_sleep * (len(jobs_seconds) - 1)
+                )
+
+            free_at = heapq.heappop(workers)
+            heapq.heappush(workers, free_at + account_seconds + accounts_sleep)
+
+        # No sleep after the last accounts
+        return max(0.0, max(workers) - accounts_sleep)
+
+    def report(self) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+        duration = round(self.estimate_duration())
+
+        logger.info(
+            f"Plan (seed {self.seed}): {len(self.jobs)} jobs of "
+            f"{len(self.get_networks_by_account())} accounts, estimated "
+            f"time {duration // 3600} hours {duration % 3600 // 60} minutes"
+        )
+        for network_name, account_ids in sorted(
+            self.get_accounts_by_network().items()
+        ):
+            logger.info(f"Plan {network_name}: {len(account_ids)} jobs")
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from settings.settings import (
+    DEFAULT_NETWORK_LANE_LIMIT,
+    NETWORK_LANE_LIMITS
+)
+
+
+class NetworkLane:
+    """
+    An execution lane of one network.
+
+    The lane runs up to `limit` jobs at the same time, but the jobs of one
+    account are serialized, because they share the account's nonce.
+
+    """
+
+    def __init__(self, network_name: str, limit: int = 1) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            network_name (str): the network name.
+            limit (int): how many jobs can run in the lane at the same time. (1)
+
+        """
+        self.network_name = network_name
+        self.limit = max(1, limit)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._account_locks: dict[str | int, asyncio.Lock] = {}
+
+        self.jobs_count = 0
+        self.success_count = 0
+        self.first_started_at: float | None = None
+        self.last_finished_at: float | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+        return self._semaphore
+
+    async def run(
+        self,
+        account_id: str | int,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run the job of the account in the lane.
+
+        Args:
+            account_id (str | int): the account name or ID.
+            func (Callable[[], Awaitable[Any]]): the coroutine function to run.
+
+        Returns:
+            Any: the result of the job.
+
+        """
+        account_lock = self._account_locks.setdefault(
+            account_id, asyncio.Lock()
+        )
+
+        async with account_lock, self._get_semaphore():
+            if self.first_started_at is None:
+                self.first_started_at = time.time()
+
+            try:
+                result = await func()
+            finally:
+                self.jobs_count += 1
+                self.last_finished_at = time.time()
+
+        if result:
+            self.success_count += 1
+
+        return result
+
+    def get_throughput(self) -> float:
+        """
+        Get the throughput of the lane.
+
+        Returns:
+            float: the finished jobs per minute.
+
+        """
+        if not self.jobs_count or self.first_started_at is None:
+            return 0.0
+
+        spent_time = max(self.last_finished_at - self.first_started_at, 1)
+
+        return round(self.jobs_count / (spent_time / 60), 2)
+
+
+class NetworkLanes:
+    LANES: dict[str, NetworkLane] = {}
+
+    @classmethod
+    def get_lane(cls, network_name: str) -> NetworkLane:
+        if network_name not in cls.LANES:
+            cls.LANES[network_name] = NetworkLane(
+                network_name=network_name,
+                limit=NETWORK_LANE_LIMITS.get(
+                    network_name, DEFAULT_NETWORK_LANE_LIMIT
+                )
+            )
+
+        return cls.LANES[network_name]
+
+    @classmethod
+    def report(cls) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+
+        for lane in cls.LANES.values():
+            logger.info(
+                f"Lane {lane.network_name}: "
+                f"{lane.success_count}/{lane.jobs_count} jobs succeeded, "
+                f"{lane.get_throughput()} jobs per minute"
+            )
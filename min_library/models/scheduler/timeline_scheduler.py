@@ -0,0 +1,174 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.others.common import AutoRepr
+
+
+class ScheduledJob(AutoRepr):
+    """
+    An (account, network) job with its planned start time.
+
+    Attributes:
+        account_id (str | int): the account name or ID.
+        network_name (str): the network name.
+        func (Callable[[], Awaitable[Any]]): the coroutine function to run.
+        start_at (float): the start time in seconds from the run start.
+
+    """
+    account_id: str | int
+    network_name: str
+    func: Callable[[], Awaitable[Any]]
+    start_at: float
+
+    def __init__(
+        self,
+        account_id: str | int,
+        network_name: str,
+        func: Callable[[], Awaitable[Any]],
+        start_at: float = 0.0
+    ) -> None:
+        self.account_id = account_id
+        self.network_name = network_name
+        self.func = func
+        self.start_at = start_at
+
+
+class TimelineScheduler:
+    """
+    Gives every (account, network) job a randomized start time and runs
+    the jobs whose time has come.
+
+    Every account and every network has its own timeline, so the total run
+    time follows the longest timeline instead of the sum of all delays.
+
+    """
+
+    def __init__(
+        self,
+        account_spacing: tuple[int, int] = (0, 0),
+        network_spacing: tuple[int, int] = (0, 0),
+        network_spacings: dict[str, tuple[int, int]] | None = None
+    ) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            account_spacing (tuple[int, int]): the min and max seconds between
+                two jobs of one account.
+            network_spacing (tuple[int, int]): the min and max seconds between
+                two jobs in one network.
+            network_spacings (dict[str, tuple[int, int]] | None): the spacings
+                of the networks that differ from `network_spacing`. (None)
+
+        """
+        self.account_spacing = account_spacing
+        self.network_spacing = network_spacing
+        self.network_spacings = network_spacings or {}
+        self._account_timelines: dict[str | int, float] = {}
+        self._network_timelines: dict[str, float] = {}
+        self._heap: list[tuple[float, int, ScheduledJob]] = []
+        self._counter = itertools.count()
+        self.logger = ConsoleLoggerSingleton.get_logger()
+
+    @staticmethod
+    def _next_start(
+        timelines: dict,
+        key: str | int,
+        spacing: tuple[int, int]
+    ) -> float:
+        if key not in timelines:
+            return 0.0
+
+        return timelines[key] + random.randint(*spacing)
+
+    def add(
+        self,
+        account_id: str | int,
+        network_name: str,
+        func: Callable[[], Awaitable[Any]]
+    ) -> ScheduledJob:
+        """
+        Plan a job right after the latest jobs of its account and network.
+
+        Args:
+            account_id (str | int): the account name or ID.
+            network_name (str): the network name.
+            func (Callable[[], Awaitable[Any]]): the coroutine function to run.
+
+        Returns:
+            ScheduledJob: the planned job.
+
+        """
+        start_at = max(
+            self._next_start(
+                self._account_timelines, account_id, self.account_spacing
+            ),
+            self._next_start(
+                self._network_timelines,
+                network_name,
+                self.network_spacings.get(network_name, self.network_spacing)
+            )
+        )
+        self._account_timelines[account_id] = start_at
+        self._network_timelines[network_name] = start_at
+
+        job = ScheduledJob(
+            account_id=account_id,
+            network_name=network_name,
+            func=func,
+            start_at=start_at
+        )
+        heapq.heappush(self._heap, (start_at, next(self._counter), job))
+
+        return job
+
+    def get_total_duration(self) -> float:
+        """
+        Get the start time of the latest planned job.
+
+        Returns:
+            float: the seconds from the run start.
+
+        """
+        return max(self._network_timelines.values(), default=0.0)
+
+    async def _run_job(self, job: ScheduledJob) -> Any:
+        self.logger.info(
+            f"{job.account_id} | {job.network_name} | "
+            f"Job started at +{round(job.start_at)} secs"
+        )
+        try:
+            return await job.func()
+        except Exception as e:
+            self.logger.error(f"{job.account_id} | {job.network_name} | {e}")
+            return False
+
+    async def run(self) -> list[Any]:
+        """
+        Run the planned jobs in order of their start time.
+
+        Returns:
+            list[Any]: the results of the jobs in order of their start.
+
+        """
+        self.logger.info(
+            f"Planned {len(self._heap)} jobs, the last one starts "
+            f"in {round(self.get_total_duration())} secs"
+        )
+        started_at = time.monotonic()
+        tasks = []
+
+        while self._heap:
+            start_at, _, job = heapq.heappop(self._heap)
+            wait = started_at + start_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            tasks.append(asyncio.create_task(self._run_job(job)))
+
+        return await asyncio.gather(*tasks)
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from hexbytes import HexBytes
+from web3.types import TxParams
+
+
+class GasEstimateCache:
+    """
+    A process-wide cache of gas estimates keyed by (chain, to, data, value),
+    so that identical calls of many accounts are estimated once.
+
+    Only the successful estimates are shared. A failed estimate (a revert
+    of one account) is raised to its own caller only, the other accounts
+    that waited for it estimate the call for themselves.
+
+    """
+    ESTIMATES: dict[tuple[int, str, str, int], tuple[int, float]] = {}
+    PENDING: dict[tuple[int, str, str, int], asyncio.Task] = {}
+    OUT_OF_GAS_ERRORS: tuple[str, ...] = (
+        'out of gas',
+        'intrinsic gas too low',
+        'gas required exceeds allowance'
+    )
+
+    @staticmethod
+    def get_key(
+        chain_id: int,
+        tx_params: TxParams | dict
+    ) -> tuple[int, str, str, int]:
+        data = tx_params.get('data', '0x')
+        if not isinstance(data, str):
+            data = HexBytes(data).hex()
+
+        return (
+            chain_id,
+            str(tx_params.get('to', '')).lower(),
+            data.lower(),
+            int(tx_params.get('value', 0))
+        )
+
+    @classmethod
+    def get(
+        cls,
+        chain_id: int,
+        tx_params: TxParams | dict,
+        ttl: int | float
+    ) -> int | None:
+        """
+        Get the cached gas estimate of the transaction.
+
+        Args:
+            chain_id (int): the chain ID.
+            tx_params (TxParams | dict): parameters of the transaction.
+            ttl (int | float): the seconds the estimate is valid for.
+
+        Returns:
+            int | None: the gas estimate or None if it's missing or expired.
+
+        """
+        key = cls.get_key(chain_id, tx_params)
+        cached = cls.ESTIMATES.get(key)
+
+        if not cached:
+            return None
+
+        if time.monotonic() - cached[1] >= ttl:
+            cls.ESTIMATES.pop(key, None)
+            return None
+
+        return cached[0]
+
+    @classmethod
+    async def get_or_estimate(
+        cls,
+        chain_id: int,
+        tx_params: TxParams | dict,
+        ttl: int | float,
+        estimate: Callable[[], Awaitable[int]]
+    ) -> int:
+        """
+        Get the cached gas estimate or estimate it once for all concurrent
+        callers with the same call. If the shared estimate fails, a caller
+        that waited for it estimates with its own `estimate`.
+
+        Args:
+            chain_id (int): the chain ID.
+            tx_params (TxParams | dict): parameters of the transaction.
+            ttl (int | float): the seconds the estimate is valid for.
+            estimate (Callable[[], Awaitable[int]]): the coroutine function
+                that estimates the gas.
+
+        Returns:
+            int: the gas estimate.
+
+        """
+        gas = cls.get(chain_id, tx_params, ttl)
+        if gas is not None:
+            return gas
+
+        key = cls.get_key(chain_id, tx_params)
+        is_own_estimate = key not in cls.PENDING
+        if is_own_estimate:
+            cls.PENDING[key] = asyncio.ensure_future(estimate())
+            cls.PENDING[key].add_done_callback(
+                lambda task: cls._on_estimated(key, task)
+            )
+
+        try:
+            return await asyncio.shield(cls.PENDING[key])
+        except Exception:
+            if is_own_estimate:
+                raise
+
+        # The error of another account's call may not apply to this one
+        return await estimate()
+
+    @classmethod
+    def _on_estimated(
+        cls,
+        key: tuple[int, str, str, int],
+        task: asyncio.Task
+    ) -> None:
+        cls.PENDING.pop(key, None)
+
+        if not task.cancelled() and task.exception() is None:
+            cls.ESTIMATES[key] = (task.result(), time.monotonic())
+
+    @classmethod
+    def invalidate(cls, chain_id: int, tx_params: TxParams | dict) -> None:
+        cls.ESTIMATES.pop(cls.get_key(chain_id, tx_params), None)
+
+    @classmethod
+    def is_out_of_gas_error(cls, error: Exception) -> bool:
+        message = str(error).lower()
+
+        return any(
+            out_of_gas_error in message
+            for out_of_gas_error in cls.OUT_OF_GAS_ERRORS
+        )
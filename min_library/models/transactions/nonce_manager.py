@@ -0,0 +1,136 @@
+import asyncio
+
+from web3 import Web3
+from eth_typing import ChecksumAddress
+
+
+class NonceState:
+    """
+    The local nonce state of one address in one network.
+
+    Attributes:
+        next_nonce (int | None): the next nonce to reserve, None if the
+            state has to be synced from the chain.
+        released (set[int]): the reserved nonces that were given back.
+        lock (asyncio.Lock): the lock of the state.
+
+    """
+    next_nonce: int | None
+    released: set[int]
+    lock: asyncio.Lock
+
+    def __init__(self) -> None:
+        self.next_nonce = None
+        self.released = set()
+        self.lock = asyncio.Lock()
+
+
+class NonceManager:
+    """
+    Reserves nonces locally per (chain, address), so several transactions
+    of one account can be sent back to back without waiting for receipts.
+
+    """
+    STATES: dict[tuple[int, str], NonceState] = {}
+    NONCE_ERRORS: tuple[str, ...] = (
+        'nonce too low',
+        'nonce too high',
+        'invalid nonce',
+        'replacement transaction underpriced'
+    )
+
+    @classmethod
+    def _get_state(cls, chain_id: int, address: ChecksumAddress) -> NonceState:
+        key = (chain_id, address.lower())
+
+        if key not in cls.STATES:
+            cls.STATES[key] = NonceState()
+
+        return cls.STATES[key]
+
+    @classmethod
+    async def reserve(
+        cls,
+        w3: Web3,
+        chain_id: int,
+        address: ChecksumAddress
+    ) -> int:
+        """
+        Reserve the next nonce of the address.
+
+        Args:
+            w3 (Web3): the Web3 instance of the network.
+            chain_id (int): the chain ID.
+            address (ChecksumAddress): the address.
+
+        Returns:
+            int: the reserved nonce.
+
+        """
+        state = cls._get_state(chain_id, address)
+
+        async with state.lock:
+            if state.next_nonce is None:
+                state.next_nonce = await w3.eth.get_transaction_count(
+                    address, 'pending'
+                )
+                state.released.clear()
+
+            if state.released:
+                nonce = min(state.released)
+                state.released.remove(nonce)
+                return nonce
+
+            nonce = state.next_nonce
+            state.next_nonce += 1
+
+            return nonce
+
+    @classmethod
+    def release(
+        cls,
+        chain_id: int,
+        address: ChecksumAddress,
+        nonce: int
+    ) -> None:
+        """
+        Give back the reserved nonce of a transaction that was not sent.
+
+        Args:
+            chain_id (int): the chain ID.
+            address (ChecksumAddress): the address.
+            nonce (int): the reserved nonce.
+
+        """
+        state = cls._get_state(chain_id, address)
+
+        if state.next_nonce is None:
+            return
+
+        if nonce == state.next_nonce - 1:
+            state.next_nonce = nonce
+            while state.next_nonce - 1 in state.released:
+                state.next_nonce -= 1
+                state.released.remove(state.next_nonce)
+        elif nonce < state.next_nonce:
+            state.released.add(nonce)
+
+    @classmethod
+    def resync(cls, chain_id: int, address: ChecksumAddress) -> None:
+        """
+        Drop the local state, so the next reservation syncs it from the chain.
+
+        Args:
+            chain_id (int): the chain ID.
+            address (ChecksumAddress): the address.
+
+        """
+        state = cls._get_state(chain_id, address)
+        state.next_nonce = None
+        state.released.clear()
+
+    @classmethod
+    def is_nonce_error(cls, error: Exception) -> bool:
+        message = str(error).lower()
+
+        return any(nonce_error in message for nonce_error in cls.NONCE_ERRORS)
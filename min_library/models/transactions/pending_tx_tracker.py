@@ -0,0 +1,244 @@
+import asyncio
+import time
+from typing import Any
+
+from hexbytes import HexBytes
+
+import min_library.models.others.exceptions as exceptions
+from min_library.models.network.provider_registry import PooledHTTPProvider
+from min_library.models.others.constants import LogStatus
+from min_library.models.others.token_amount import TokenAmount
+from min_library.models.transactions.tx import Tx
+from settings.settings import (
+    FEE_BUMP_AFTER_BLOCKS,
+    FEE_BUMP_MAX_GWEI,
+    FEE_BUMP_MAX_MULTIPLIER,
+    FEE_BUMP_MULTIPLIER,
+    MIN_RECEIPT_TIMEOUT,
+    RECEIPT_TIMEOUT_BLOCKS
+)
+
+
+class PendingTxTracker:
+    """
+    Waits for a sent transaction and replaces it if it is stuck.
+
+    If the transaction is not included within FEE_BUMP_AFTER_BLOCKS blocks,
+    it is checked against the current gas price: an under-priced one is
+    signed again with the same nonce and the fees increased by
+    FEE_BUMP_MULTIPLIER (at least by 10%), unless that is above the caps,
+    any other one is sent again as it is, in case a node dropped it. All
+    the transactions of the replacement chain are awaited until one of
+    them lands.
+
+    """
+
+    def __init__(self, transaction) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            transaction (Transaction): the transaction helper of the account
+                that sent the transaction.
+
+        """
+        self.transaction = transaction
+        self.account_manager = transaction.account_manager
+
+    @staticmethod
+    def get_fee_keys(tx_params: dict) -> tuple[str, ...]:
+        if 'maxFeePerGas' in tx_params:
+            return 'maxFeePerGas', 'maxPriorityFeePerGas'
+
+        return 'gasPrice',
+
+    def get_fee_caps(self, tx_params: dict) -> dict[str, int]:
+        """
+        Get the highest fees the transaction may be replaced with.
+
+        Args:
+            tx_params (dict): parameters of the first transaction.
+
+        Returns:
+            dict[str, int]: the caps of the fee parameters in Wei.
+
+        """
+        network = self.account_manager.network
+        max_fee = None
+        if network.name in FEE_BUMP_MAX_GWEI:
+            max_fee = TokenAmount(
+                amount=FEE_BUMP_MAX_GWEI[network.name], decimals=9
+            ).Wei
+
+        fee_key = self.get_fee_keys(tx_params)[0]
+        fee_cap = int(tx_params[fee_key] * FEE_BUMP_MAX_MULTIPLIER)
+        if max_fee is not None:
+            fee_cap = min(fee_cap, max(max_fee, tx_params[fee_key]))
+
+        # The tip is paid out of the max fee, so the cap of the max fee
+        # bounds it too: a zero tip can still be bumped
+        return {fee_key: fee_cap for fee_key in self.get_fee_keys(tx_params)}
+
+    async def is_underpriced(self, tx_params: dict) -> bool:
+        gas_price = await self.transaction.get_gas_price()
+        fee_key = self.get_fee_keys(tx_params)[0]
+
+        return tx_params[fee_key] < gas_price.Wei
+
+    @staticmethod
+    def get_min_replacement_fee(fee: int) -> int:
+        # Nodes accept a replacement only if every fee is 10% higher
+        return fee * 110 // 100 + 1
+
+    def get_bumped_params(
+        self,
+        tx_params: dict,
+        fee_caps: dict[str, int]
+    ) -> dict | None:
+        """
+        Get the parameters of the replacement transaction: every fee is
+        multiplied by FEE_BUMP_MULTIPLIER, but at least by 10% and 1 Wei,
+        since nodes reject a smaller bump.
+
+        Args:
+            tx_params (dict): parameters of the last transaction.
+            fee_caps (dict[str, int]): the caps of the fee parameters.
+
+        Returns:
+            dict | None: the parameters with the bumped fees or None if the
+                caps do not allow the bump.
+
+        """
+        bumped_params = dict(tx_params)
+        for fee_key, fee_cap in fee_caps.items():
+            bumped_params[fee_key] = min(
+                max(
+                    int(tx_params[fee_key] * FEE_BUMP_MULTIPLIER),
+                    self.get_min_replacement_fee(tx_params[fee_key])
+                ),
+                fee_cap
+            )
+
+        if 'maxPriorityFeePerGas' in bumped_params:
+            bumped_params['maxPriorityFeePerGas'] = min(
+                bumped_params['maxPriorityFeePerGas'],
+                bumped_params['maxFeePerGas']
+            )
+
+        if any(
+            bumped_params[fee_key]
+            < self.get_min_replacement_fee(tx_params[fee_key])
+            for fee_key in fee_caps
+        ):
+            return None
+
+        return bumped_params
+
+    async def _send(self, tx_params: dict) -> HexBytes | None:
+        signed_tx = await self.transaction.sign_transaction(tx_params)
+
+        try:
+            return await self.account_manager.w3.eth.send_raw_transaction(
+                transaction=signed_tx.rawTransaction
+            )
+        except Exception as e:
+            if PooledHTTPProvider.is_already_known_error(e):
+                return signed_tx.hash
+            # One of the replacement chain has landed meanwhile
+            if 'nonce too low' in str(e).lower():
+                return None
+            raise
+
+    async def wait(self, tx: Tx) -> dict[str, Any]:
+        """
+        Wait for the receipt of the transaction or of one of its
+        replacements. The instance of the transaction gets the hash,
+        parameters and receipt of the landed one.
+
+        Args:
+            tx (Tx): the sent transaction.
+
+        Returns:
+            dict[str, Any]: the transaction receipt.
+
+        """
+        logger = self.account_manager.custom_logger
+        network = self.account_manager.network
+        w3 = self.account_manager.w3
+        block_time_model = network.block_time_model
+        await block_time_model.ensure_updated(w3)
+
+        deadline = time.monotonic() + block_time_model.get_receipt_timeout(
+            blocks=RECEIPT_TIMEOUT_BLOCKS,
+            min_timeout=MIN_RECEIPT_TIMEOUT
+        )
+        bump_window = block_time_model.block_time * FEE_BUMP_AFTER_BLOCKS
+        fee_caps = self.get_fee_caps(tx.params)
+        tx_params = tx.params
+        waits: dict[asyncio.Task, tuple[Tx, dict]] = {}
+
+        def add_wait(tx_hash: HexBytes, tx_params: dict) -> None:
+            chain_tx = Tx(tx_hash=tx_hash, params=tx_params)
+            task = asyncio.create_task(chain_tx.wait_for_tx_receipt(
+                web3=w3,
+                timeout=max(deadline - time.monotonic(), 0),
+                network=network
+            ))
+            waits[task] = (chain_tx, tx_params)
+
+        add_wait(tx.hash, tx_params)
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    waits,
+                    timeout=min(bump_window, max(deadline - time.monotonic(), 0)),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        chain_tx, chain_tx_params = waits[task]
+                        tx.hash = chain_tx.hash
+                        tx.params = chain_tx_params
+                        tx.receipt = task.result()
+
+                        return tx.receipt
+
+                    waits.pop(task)
+
+                if time.monotonic() >= deadline or not waits:
+                    raise exceptions.TransactionException(
+                        f'Transaction {tx.hash.hex()} and its replacements '
+                        f'have not landed in time'
+                    )
+
+                try:
+                    if await self.is_underpriced(tx_params):
+                        bumped_params = self.get_bumped_params(
+                            tx_params, fee_caps
+                        )
+                        if bumped_params is None:
+                            continue
+
+                        tx_hash = await self._send(bumped_params)
+                        if tx_hash is None:
+                            continue
+
+                        tx_params = bumped_params
+                        add_wait(tx_hash, tx_params)
+                        logger.log_message(
+                            level=LogStatus.WARNING,
+                            message=(
+                                f'Transaction is stuck, replaced with higher '
+                                f'fees: {HexBytes(tx_hash).hex()}'
+                            )
+                        )
+                    else:
+                        await self._send(tx_params)
+                except Exception as e:
+                    logger.log_message(
+                        level=LogStatus.WARNING,
+                        message=f'Replacement failed: {e}'
+                    )
+        finally:
+            for task in waits:
+                task.cancel()
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from typing import Any
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3.exceptions import TimeExhausted
+from web3.types import _Hash32
+
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.network.network import Network
+from min_library.models.network.new_heads_listener import NewHeadsListener
+
+
+class ReceiptWatcher:
+    """
+    A receipt watcher of one network.
+
+    It tracks all pending transaction hashes and checks them with one
+    batched eth_getTransactionReceipt request per new block, so the RPC load
+    doesn't grow with the count of transactions in flight. New blocks are
+    pushed by the network's NewHeadsListener if it's connected, otherwise
+    they are polled.
+
+    """
+    WATCHERS: dict[str, 'ReceiptWatcher'] = {}
+
+    def __init__(self, network: Network) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            network (Network): the network, its block time model sets the
+                interval between two checks of the latest block number.
+
+        """
+        self.network = network
+        self.block_number: int | None = None
+        self.latencies: list[float] = []
+        self._pending: dict[str, tuple[asyncio.Future, float]] = {}
+        self._waiters_counts: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def get_watcher(cls, network: Network) -> 'ReceiptWatcher':
+        if network.name not in cls.WATCHERS:
+            cls.WATCHERS[network.name] = ReceiptWatcher(network)
+
+        return cls.WATCHERS[network.name]
+
+    async def wait(
+        self,
+        web3: Web3,
+        tx_hash: _Hash32,
+        timeout: int | float = 120
+    ) -> dict[str, Any]:
+        """
+        Wait for the transaction receipt, TimeExhausted is raised if it's
+        not received in time.
+
+        Args:
+            web3 (Web3): the Web3 instance of the network.
+            tx_hash (_Hash32): the transaction hash.
+            timeout (int | float): the receipt waiting timeout. (120 sec)
+
+        Returns:
+            dict[str, Any]: the transaction receipt.
+
+        """
+        tx_hash = HexBytes(tx_hash).hex()
+
+        if tx_hash not in self._pending:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[tx_hash] = (future, time.monotonic())
+
+        future = self._pending[tx_hash][0]
+        self._waiters_counts[tx_hash] = self._waiters_counts.get(tx_hash, 0) + 1
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run(web3))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(
+                f"Transaction {tx_hash} is not in the chain after "
+                f"{timeout} seconds"
+            )
+        finally:
+            # The hash is watched while anyone else still waits for it
+            self._waiters_counts[tx_hash] -= 1
+            if not self._waiters_counts[tx_hash]:
+                self._waiters_counts.pop(tx_hash)
+                self._pending.pop(tx_hash, None)
+
+    async def _run(self, web3: Web3) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+        block_time_model = self.network.block_time_model
+        listener = NewHeadsListener.start_for(self.network)
+        errors_count = 0
+
+        while self._pending:
+            poll_interval = block_time_model.get_poll_interval()
+
+            try:
+                block_number = None
+                if listener and listener.is_connected:
+                    block_number = await listener.wait_for_new_head(
+                        timeout=block_time_model.block_time * 2
+                    )
+                    poll_interval = 0
+
+                if block_number is None:
+                    block_number = await web3.eth.block_number
+
+                if block_number != self.block_number:
+                    self.block_number = block_number
+                    self.network.gas_oracle.on_new_block(block_number)
+                    await self._check_receipts(web3)
+
+                errors_count = 0
+            except Exception as e:
+                logger.warning(
+                    f"{self.network.name} | Receipt watcher error: {e}"
+                )
+                backoff_schedule = block_time_model.get_backoff_schedule()
+                poll_interval = backoff_schedule[
+                    min(errors_count, len(backoff_schedule) - 1)
+                ]
+                errors_count += 1
+
+            await asyncio.sleep(poll_interval)
+
+    async def _check_receipts(self, web3: Web3) -> None:
+        tx_hashes = list(self._pending)
+        responses = await web3.provider.make_batch_request([
+            ('eth_getTransactionReceipt', [tx_hash]) for tx_hash in tx_hashes
+        ])
+
+        for tx_hash, response in zip(tx_hashes, responses):
+            receipt = response.get('result')
+            if not receipt or tx_hash not in self._pending:
+                continue
+
+            future, sent_at = self._pending.pop(tx_hash)
+            self.latencies.append(time.monotonic() - sent_at)
+
+            if not future.done():
+                future.set_result(dict(receipt_formatter(receipt)))
+
+    @classmethod
+    def report(cls) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+
+        for watcher in cls.WATCHERS.values():
+            if not watcher.latencies:
+                continue
+
+            average_latency = sum(watcher.latencies) / len(watcher.latencies)
+            logger.info(
+                f"Receipts {watcher.network.name}: "
+                f"{len(watcher.latencies)} confirmed, "
+                f"average {round(average_latency, 2)} secs, "
+                f"max {round(max(watcher.latencies), 2)} secs"
+            )
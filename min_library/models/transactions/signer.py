@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor
+)
+
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
+from eth_keys.backends import get_backend_class
+from web3.types import TxParams
+
+from settings.settings import (
+    SIGNING_EXECUTOR,
+    SIGNING_WORKERS
+)
+
+
+def sign_transaction_dict(
+    private_key: bytes,
+    tx_params: dict
+) -> SignedTransaction:
+    """
+    Sign the transaction. Module-level, so it can be sent to a process pool.
+
+    Args:
+        private_key (bytes): the private key.
+        tx_params (dict): parameters of the transaction.
+
+    Returns:
+        SignedTransaction: the signed transaction.
+
+    """
+    return Account.sign_transaction(tx_params, private_key)
+
+
+class Signer:
+    """
+    Signs transactions in a thread or process pool, so that secp256k1,
+    RLP and keccak don't block the event loop.
+
+    eth_keys picks its coincurve backend (libsecp256k1, in requirements)
+    when it can be imported and the pure-Python one otherwise, which is
+    several times slower. `get_backend_name` tells which one is used.
+
+    """
+    EXECUTOR_TYPE: str | None = SIGNING_EXECUTOR
+    EXECUTOR: Executor | None = None
+
+    @staticmethod
+    def get_backend_name() -> str:
+        return get_backend_class().__name__
+
+    @classmethod
+    def get_executor(cls) -> Executor | None:
+        if cls.EXECUTOR is None and cls.EXECUTOR_TYPE == 'thread':
+            cls.EXECUTOR = ThreadPoolExecutor(max_workers=SIGNING_WORKERS)
+        elif cls.EXECUTOR is None and cls.EXECUTOR_TYPE == 'process':
+            cls.EXECUTOR = ProcessPoolExecutor(max_workers=SIGNING_WORKERS)
+
+        return cls.EXECUTOR
+
+    @classmethod
+    async def sign(
+        cls,
+        account: LocalAccount,
+        tx_params: TxParams,
+        executor: Executor | None = None
+    ) -> SignedTransaction:
+        """
+        Sign the transaction of the account off the event loop.
+
+        Args:
+            account (LocalAccount): the account.
+            tx_params (TxParams): parameters of the transaction.
+            executor (Executor | None): the pool to sign in instead of the
+                configured one. (None)
+
+        Returns:
+            SignedTransaction: the signed transaction.
+
+        """
+        executor = executor or cls.get_executor()
+        if executor is None:
+            return account.sign_transaction(transaction_dict=tx_params)
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            executor, sign_transaction_dict, account.key, dict(tx_params)
+        )
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls.EXECUTOR is not None:
+            cls.EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            cls.EXECUTOR = None
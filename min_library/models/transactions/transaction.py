@@ -1,3 +1,6 @@
+import asyncio
+from concurrent.futures import Executor
+
 from web3.types import (
     TxParams
 )
@@ -7,8 +10,20 @@ from eth_account.datastructures import (
 )
 
 from min_library.models.account.account_manager import AccountManager
+from min_library.models.metrics.metrics import Metrics
+from min_library.models.network.new_heads_listener import NewHeadsListener
 from min_library.models.others.token_amount import TokenAmount
+from min_library.models.transactions.gas_estimate_cache import GasEstimateCache
+from min_library.models.transactions.nonce_manager import NonceManager
+from min_library.models.transactions.pending_tx_tracker import PendingTxTracker
+from min_library.models.transactions.signer import Signer
 from min_library.models.transactions.tx import Tx
+from settings.settings import (
+    GAS_ESTIMATE_MARGIN,
+    GAS_ESTIMATE_TTL,
+    IS_FEE_BUMPING,
+    IS_GAS_ESTIMATE_CACHE
+)
 
 
 class Transaction:
@@ -33,79 +48,70 @@ class Transaction:
         nonce = await self.account_manager.w3.eth.get_transaction_count(address)
         return nonce
 
-    async def get_gas_price(self) -> TokenAmount:
+    async def reserve_nonce(self) -> int:
         """
-        Get the current gas price
+        Reserve the next nonce of the account in the local nonce manager.
 
-        Return:
-            Wei 
+        Returns:
+            int: the reserved nonce.
 
         """
-        amount = await self.account_manager.w3.eth.gas_price
-
-        return TokenAmount(
-            amount=amount,
-            decimals=self.account_manager.network.decimals,
-            wei=True
+        return await NonceManager.reserve(
+            w3=self.account_manager.w3,
+            chain_id=self.account_manager.network.chain_id,
+            address=self.account_manager.account.address
         )
 
-    async def get_max_priority_fee_(
-        self,
-        block: dict | None = None
-    ) -> TokenAmount:
+    def release_nonce(self, nonce: int, error: Exception | None = None) -> None:
         """
-        Get the current max priority fee
+        Give back the reserved nonce of a transaction that was not sent or
+        resync the nonces from the chain if the node rejected the nonce.
 
-        Returns:
-            Wei: the current max priority fee
+        Args:
+            nonce (int): the reserved nonce.
+            error (Exception | None): the error of the sending. (None)
 
         """
-        if not block:
-            block = await self.account_manager.w3.eth.get_block('latest')
+        chain_id = self.account_manager.network.chain_id
+        address = self.account_manager.account.address
 
-        block_number = block['number']
-        latest_block_transaction_count = (
-            await self.account_manager.w3.eth.get_block_transaction_count(
-                block_number)
-        )
-        max_priority_fee_per_gas_lst = []
+        if error and NonceManager.is_nonce_error(error):
+            NonceManager.resync(chain_id, address)
+        else:
+            NonceManager.release(chain_id, address, nonce)
 
-        for i in range(latest_block_transaction_count):
-            try:
-                transaction = (
-                    await self.account_manager.w3.eth.get_transaction_by_block(
-                        block_number, i
-                    )
-                )
-                if 'maxPriorityFeePerGas' in transaction:
-                    max_priority_fee_per_gas_lst.append(
-                        transaction['maxPriorityFeePerGas']
-                    )
-            except Exception:
-                continue
+    async def get_gas_price(self) -> TokenAmount:
+        """
+        Get the current gas price
+
+        Return:
+            Wei 
+
+        """
+        amount = await self.account_manager.network.gas_oracle.get_gas_price(
+            self.account_manager.w3
+        )
 
-        if not max_priority_fee_per_gas_lst:
-            # max_priority_fee_per_gas = w3.eth.max_priority_fee
-            max_priority_fee_per_gas = 0
-        else:
-            max_priority_fee_per_gas_lst.sort()
-            max_priority_fee_per_gas = max_priority_fee_per_gas_lst[len(
-                max_priority_fee_per_gas_lst) // 2]
         return TokenAmount(
-            amount=max_priority_fee_per_gas,
+            amount=amount,
             decimals=self.account_manager.network.decimals,
             wei=True
         )
 
     async def get_max_priority_fee(self) -> TokenAmount:
         """
-        Get the current max priority fee
+        Get the current max priority fee estimated by the gas oracle from
+        the fee history of the last blocks.
 
         Returns:
             Wei: the current max priority fee
 
         """
-        max_priority_fee = await self.account_manager.w3.eth.max_priority_fee
+        max_priority_fee = await (
+            self.account_manager.network.gas_oracle.get_max_priority_fee(
+                self.account_manager.w3
+            )
+        )
 
         return TokenAmount(
             max_priority_fee,
@@ -116,6 +122,9 @@ class Transaction:
     async def get_estimate_gas(self, tx_params: TxParams) -> TokenAmount:
         """
         Get the estimate gas limit for a transaction with specified parameters.
+        If the gas estimate cache is on, the estimate of the same call
+        (chain, to, data, value) is reused with a safety margin and the
+        transaction is only checked for a revert with eth_call.
 
         Args:
             tx_params (TxParams): parameters of the transaction.
@@ -124,7 +133,36 @@ class Transaction:
             Wei: the estimate gas.
 
         """
-        gas_price = await self.account_manager.w3.eth.estimate_gas(transaction=tx_params)
+        chain_id = self.account_manager.network.chain_id
+
+        if not IS_GAS_ESTIMATE_CACHE:
+            gas_price = await self.account_manager.w3.eth.estimate_gas(
+                transaction=tx_params
+            )
+        else:
+            estimate_params = dict(tx_params)
+            is_estimated = False
+
+            async def estimate() -> int:
+                nonlocal is_estimated
+                is_estimated = True
+                return await self.account_manager.w3.eth.estimate_gas(
+                    transaction=estimate_params
+                )
+
+            gas_price = await GasEstimateCache.get_or_estimate(
+                chain_id=chain_id,
+                tx_params=estimate_params,
+                ttl=GAS_ESTIMATE_TTL,
+                estimate=estimate
+            )
+            if not is_estimated:
+                # The shared estimate was made for another wallet, so a
+                # revert of this one (funds, already minted) is checked by
+                # a single call, it raises as the estimate would
+                await self.account_manager.w3.eth.call(estimate_params)
+
+            gas_price = int(gas_price * GAS_ESTIMATE_MARGIN)
 
         return TokenAmount(
             gas_price,
@@ -132,6 +170,48 @@ class Transaction:
             wei=True
         )
 
+    def invalidate_gas_estimate(
+        self,
+        tx_params: TxParams,
+        error: Exception | None = None
+    ) -> None:
+        """
+        Drop the cached gas estimate of the transaction.
+
+        Args:
+            tx_params (TxParams): parameters of the transaction.
+            error (Exception | None): the error of the sending, the estimate
+                is dropped only if it's an out of gas error. (None)
+
+        """
+        if error and not GasEstimateCache.is_out_of_gas_error(error):
+            return
+
+        GasEstimateCache.invalidate(
+            self.account_manager.network.chain_id, tx_params
+        )
+
+    def check_out_of_gas(self, tx: Tx) -> bool:
+        """
+        Check if the mined transaction has failed because of out of gas and
+        drop its cached gas estimate if so.
+
+        Args:
+            tx (Tx): the transaction with the receipt.
+
+        Returns:
+            bool: True if the transaction has run out of gas.
+
+        """
+        if not tx.receipt or not tx.params or tx.receipt.get('status') != 0:
+            return False
+
+        if tx.receipt.get('gasUsed', 0) < tx.params.get('gas', 0):
+            return False
+
+        self.invalidate_gas_estimate(tx.params)
+        return True
+
     async def auto_add_params(self, tx_params: TxParams | dict) -> TxParams:
         """
         Add 'chainId', 'nonce', 'from', 'gasPrice' or 'maxFeePerGas' + 'maxPriorityFeePerGas' and 'gas' parameters to
@@ -144,49 +224,96 @@ class Transaction:
             TxParams: parameters of the transaction with added values.
 
         """
+        with Metrics.measure(
+            'auto_add_params', self.account_manager.network.name
+        ):
+            return await self._auto_add_params(tx_params)
+
+    async def _auto_add_params(self, tx_params: TxParams | dict) -> TxParams:
+        NewHeadsListener.start_for(self.account_manager.network)
+
         if 'chainId' not in tx_params:
             tx_params['chainId'] = self.account_manager.network.chain_id
 
-        if not tx_params.get('nonce'):
-            tx_params['nonce'] = await self.get_nonce()
-
         if 'from' not in tx_params:
             tx_params['from'] = self.account_manager.account.address
 
         is_eip_1559_tx_type = self.account_manager.network.tx_type == 2
-        current_gas_price = await self.get_gas_price()
 
-        if is_eip_1559_tx_type:
-            tx_params['maxFeePerGas'] = tx_params.pop('gasPrice', current_gas_price.Wei)
+        # The lookups don't depend on each other, so they go out together
+        lookups = {}
+        if not tx_params.get('nonce'):
+            lookups['nonce'] = self.reserve_nonce()
+
+        if 'gasPrice' not in tx_params:
+            lookups['gas_price'] = self.get_gas_price()
+
+        if (
+            (is_eip_1559_tx_type or 'maxFeePerGas' in tx_params)
+            and 'maxPriorityFeePerGas' not in tx_params
+        ):
+            lookups['max_priority_fee'] = self.get_max_priority_fee()
+
+        results = dict(zip(lookups, await asyncio.gather(
+            *lookups.values(), return_exceptions=True
+        )))
+
+        # The reserved nonce is kept even if another lookup failed,
+        # so that the caller can release it
+        if 'nonce' in results and not isinstance(results['nonce'], Exception):
+            tx_params['nonce'] = results['nonce']
+
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+
+        if is_eip_1559_tx_type and 'gasPrice' in tx_params:
+            tx_params['maxFeePerGas'] = tx_params.pop('gasPrice')
+
+        elif is_eip_1559_tx_type:
+            tx_params['maxFeePerGas'] = results['gas_price'].Wei
 
         elif 'gasPrice' not in tx_params:
-            tx_params['gasPrice'] = current_gas_price.Wei
+            tx_params['gasPrice'] = results['gas_price'].Wei
 
         if 'maxFeePerGas' in tx_params and 'maxPriorityFeePerGas' not in tx_params:
-            tx_params['maxPriorityFeePerGas'] = (await self.get_max_priority_fee()).Wei
+            tx_params['maxPriorityFeePerGas'] = results['max_priority_fee'].Wei
             tx_params['maxFeePerGas'] += tx_params['maxPriorityFeePerGas']
 
         multiplier_of_gas = tx_params.pop('multiplier', 1)
 
         if not tx_params.get('gas') or not int(tx_params['gas']):
-            gas = await self.get_estimate_gas(tx_params=tx_params)
+            with Metrics.measure(
+                'estimate_gas', self.account_manager.network.name
+            ):
+                gas = await self.get_estimate_gas(tx_params=tx_params)
             tx_params['gas'] = int(gas.Wei * multiplier_of_gas)
 
         return tx_params
 
-    async def sign_transaction(self, tx_params: TxParams) -> SignedTransaction:
+    async def sign_transaction(
+        self,
+        tx_params: TxParams,
+        executor: Executor | None = None
+    ) -> SignedTransaction:
         """
-        Sign a transaction.
+        Sign a transaction off the event loop, in the signing pool.
 
         Args:
             tx_params (TxParams): parameters of the transaction.
+            executor (Executor | None): the pool to sign in instead of the
+                configured one. (None)
 
         Returns:
             SignedTransaction: the signed transaction.
 
         """
-        signed_tx = self.account_manager.account.sign_transaction(
-            transaction_dict=tx_params)
+        with Metrics.measure('sign', self.account_manager.network.name):
+            signed_tx = await Signer.sign(
+                account=self.account_manager.account,
+                tx_params=tx_params,
+                executor=executor
+            )
 
         return signed_tx
 
@@ -202,10 +329,56 @@ class Transaction:
             Tx: the instance of the sent transaction.
 
         """
-        tx_params = await self.auto_add_params(tx_params)
-        signed_tx = await self.sign_transaction(tx_params)
-        tx_hash = await self.account_manager.w3.eth.send_raw_transaction(
-            transaction=signed_tx.rawTransaction
-        )
+        is_nonce_reserved = not tx_params.get('nonce')
+        original_params = dict(tx_params)
+
+        for attempt in range(2):
+            # Every attempt is built from the caller's params, not from the
+            # fees and gas the failed attempt has added
+            tx_params = dict(original_params)
+            try:
+                tx_params = await self.auto_add_params(tx_params)
+                signed_tx = await self.sign_transaction(tx_params)
+                with Metrics.measure(
+                    'broadcast',
+                    self.account_manager.network.name,
+                    get_endpoint=lambda: (
+                        self.account_manager.w3.provider.endpoint_uri
+                    )
+                ):
+                    tx_hash = await self.account_manager.w3.eth.send_raw_transaction(
+                        transaction=signed_tx.rawTransaction
+                    )
+                break
+            except Exception as e:
+                self.invalidate_gas_estimate(tx_params, error=e)
+
+                if not is_nonce_reserved or 'nonce' not in tx_params:
+                    raise
+
+                self.release_nonce(tx_params.pop('nonce'), error=e)
+                if attempt or not NonceManager.is_nonce_error(e):
+                    raise
 
         return Tx(tx_hash=tx_hash, params=tx_params)
+
+    async def wait_for_receipt(self, tx: Tx) -> dict:
+        """
+        Wait for the receipt of the sent transaction. If fee bumping is on,
+        a stuck transaction is replaced with higher fees and the instance
+        of the transaction gets the hash and parameters of the landed one.
+
+        Args:
+            tx (Tx): the sent transaction.
+
+        Returns:
+            dict: the transaction receipt.
+
+        """
+        if IS_FEE_BUMPING:
+            return await PendingTxTracker(self).wait(tx)
+
+        return await tx.wait_for_tx_receipt(
+            web3=self.account_manager.w3,
+            network=self.account_manager.network
+        )
@@ -8,7 +8,15 @@ from web3.types import (
 )
 
 import min_library.models.others.exceptions as exceptions
+from min_library.models.metrics.metrics import Metrics
+from min_library.models.network.network import Network
 from min_library.models.others.common import AutoRepr
+from min_library.models.transactions.receipt_watcher import ReceiptWatcher
+from settings.settings import (
+    IS_RECEIPT_WATCHER,
+    MIN_RECEIPT_TIMEOUT,
+    RECEIPT_TIMEOUT_BLOCKS
+)
 
 
 
@@ -59,23 +67,55 @@ class Tx(AutoRepr):
     async def wait_for_tx_receipt(
         self,
         web3: Web3 | AsyncWeb3,
-        timeout: int | float = 120,
-        poll_latency: float = 0.1
+        timeout: int | float | None = None,
+        poll_latency: float | None = None,
+        network: Network | None = None
     ) -> dict[str, Any]:
         """
         Wait for the transaction receipt.
 
         Args:
             web3 (Union[Web3, AsyncWeb3]): the Web3 instance.
-            timeout (Union[int, float]): the receipt waiting timeout. (120 sec)
-            poll_latency (float): the poll latency. (0.1 sec)
+            timeout (Optional[Union[int, float]]): the receipt waiting timeout.
+                (derived from the network's block time or 120 sec)
+            poll_latency (Optional[float]): the poll latency.
+                (derived from the network's block time or 0.1 sec)
+            network (Optional[Network]): the network of the transaction, if
+                set, the receipt is awaited via the network's receipt
+                watcher. (None)
 
         Returns:
             Dict[str, Any]: the transaction receipt.
 
         """
-        self.receipt = dict(await web3.eth.wait_for_transaction_receipt(
-            transaction_hash=self.hash, timeout=timeout, poll_latency=poll_latency
-        ))
+        if network:
+            block_time_model = network.block_time_model
+            await block_time_model.ensure_updated(web3)
+
+            if timeout is None:
+                timeout = block_time_model.get_receipt_timeout(
+                    blocks=RECEIPT_TIMEOUT_BLOCKS,
+                    min_timeout=MIN_RECEIPT_TIMEOUT
+                )
+            if poll_latency is None:
+                poll_latency = block_time_model.get_poll_interval()
+
+        timeout = 120 if timeout is None else timeout
+        poll_latency = 0.1 if poll_latency is None else poll_latency
+
+        with Metrics.measure(
+            'receipt',
+            network.name if network else 'unknown',
+            get_endpoint=lambda: web3.provider.endpoint_uri
+        ):
+            if network and IS_RECEIPT_WATCHER:
+                self.receipt = await ReceiptWatcher.get_watcher(network).wait(
+                    web3=web3, tx_hash=self.hash, timeout=timeout
+                )
+                return self.receipt
+
+            self.receipt = dict(await web3.eth.wait_for_transaction_receipt(
+                transaction_hash=self.hash, timeout=timeout, poll_latency=poll_latency
+            ))
 
         return self.receipt
@@ -1,46 +1,123 @@
+import asyncio
 import random
 from min_library.models.client import Client
+from min_library.models.journal.run_journal import RunJournal
 from min_library.models.network.networks import Networks
+from min_library.models.others.constants import LogStatus
+from min_library.models.scheduler.mint_plan import MintPlan
+from min_library.models.scheduler.network_lanes import NetworkLanes
 from settings.settings import (
+    BROADCAST_RATE,
     IS_CREATE_LOGS_FOR_EVERY_WALLET,
+    IS_PARALLEL_NETWORKS,
     IS_SLEEP,
     MINT_NETWORKS,
+    PRESIGNED_TXS_FILE,
     SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO,
     SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM
 )
+from tasks.bulk_mint import BulkMint
 from tasks.zk_bridge import ZkBridge
 
 
-async def mint_polyhedra_2024_nft(account_id, private_key) -> bool:
-    await _mint_one_nft_or_some_nfts(account_id, private_key, "Polyhedra 2024")
+async def mint_polyhedra_2024_nft(
+    account_id, private_key, network_names=None
+) -> bool:
+    return await _mint_one_nft_or_some_nfts(
+        account_id, private_key, "Polyhedra 2024", network_names
+    )
+
+
+async def presign_polyhedra_2024_nft(accounts) -> int:
+    return await _presign_nfts(accounts, "Polyhedra 2024")
+
+
+async def broadcast_presigned_txs(accounts) -> int:
+    bulk_mint = BulkMint(path=PRESIGNED_TXS_FILE)
+
+    return await bulk_mint.broadcast(rate=BROADCAST_RATE)
+
 
 ## -------------------- DONT TOUCH IT ----------------------
-async def _mint_one_nft_or_some_nfts(account_id, private_key, nft_name) -> bool:
-    random.shuffle(MINT_NETWORKS)
-    has_minted_one_time = False
+MODULES_NFT_NAMES = {
+    mint_polyhedra_2024_nft: "Polyhedra 2024",
+    presign_polyhedra_2024_nft: "Polyhedra 2024"
+}
+
+# Modules that handle all accounts at once
+BULK_MODULES = (
+    presign_polyhedra_2024_nft,
+    broadcast_presigned_txs
+)
+
+
+def get_mint_networks() -> list[str]:
+    return MintPlan.choose_network_names(MINT_NETWORKS, random.Random())
+
+
+def _get_client(account_id, private_key, network_name) -> Client:
+    network_object = Networks.get_network(network_name=network_name)
+
+    return Client(
+        account_id=account_id,
+        private_key=private_key,
+        network=network_object,
+        create_log_file_per_account=IS_CREATE_LOGS_FOR_EVERY_WALLET
+    )
 
-    for option in MINT_NETWORKS:
-        network_name = random.choice(option)
-        if network_name is None:
-            continue
-
-        network_object = Networks.get_network(network_name=network_name)
-        client = Client(
-            account_id=account_id,
-            private_key=private_key,
-            network=network_object,
-            create_log_file_per_account=IS_CREATE_LOGS_FOR_EVERY_WALLET
-        )
-        zkbridge = ZkBridge(client)
 
-        network = client.account_manager.network.name
-        is_result = await zkbridge.mint(
-            nft_name=nft_name,
-            network=network
+async def _mint_with_client(client: Client, nft_name) -> bool:
+    zkbridge = ZkBridge(client)
+    network = client.account_manager.network.name
+
+    address = client.account_manager.account.address
+    if RunJournal.is_skipped(address, network, nft_name):
+        client.account_manager.custom_logger.log_message(
+            level=LogStatus.INFO,
+            message=(
+                f'Skipped, the mint is '
+                f'{RunJournal.get_state(address, network, nft_name)} '
+                f'in the journal'
+            )
         )
+        return False
+
+    return await NetworkLanes.get_lane(network).run(
+        account_id=client.account_manager.account_id,
+        func=lambda: zkbridge.mint(nft_name=nft_name, network=network)
+    )
+
 
-        if IS_SLEEP and network != MINT_NETWORKS[-1] and is_result:
+async def mint_nft_on_network(
+    account_id, private_key, nft_name, network_name
+) -> bool:
+    client = _get_client(account_id, private_key, network_name)
+
+    return await _mint_with_client(client, nft_name)
+
+
+async def _mint_one_nft_or_some_nfts(
+    account_id, private_key, nft_name, network_names=None
+) -> bool:
+    if network_names is None:
+        network_names = get_mint_networks()
+    has_minted_one_time = False
+
+    if IS_PARALLEL_NETWORKS:
+        results = await asyncio.gather(*[
+            mint_nft_on_network(account_id, private_key, nft_name, network_name)
+            for network_name in network_names
+        ])
+        return any(results)
+
+    for network_name in network_names:
+        client = _get_client(account_id, private_key, network_name)
+        is_result = await _mint_with_client(client, nft_name)
+
+        if is_result:
             has_minted_one_time = is_result
+
+        if IS_SLEEP and network_name != network_names[-1] and is_result:
             await client.initial_delay(
                 sleep_from=SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM,
                 sleep_to=SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO,
@@ -48,3 +125,14 @@ async def _mint_one_nft_or_some_nfts(account_id, private_key, nft_name) -> bool:
             )
 
     return has_minted_one_time
+
+
+async def _presign_nfts(accounts, nft_name) -> int:
+    clients = [
+        _get_client(account["name"], account["key"], network_name)
+        for account in accounts
+        for network_name in account.get("networks", get_mint_networks())
+    ]
+    bulk_mint = BulkMint(path=PRESIGNED_TXS_FILE, nft_name=nft_name)
+
+    return await bulk_mint.presign(clients)
@@ -10,6 +10,12 @@ IS_ACCOUNT_NAMES = True
 # Do you want to shuffle wallets?
 IS_SHUFFLE_WALLETS = True
 
+# How many wallets will be processed at the same time?
+#   1 - wallets are processed one by one
+#   N - up to N wallets are processed in parallel (every wallet
+#       still does its mints in order)
+WORKERS_COUNT = 1
+
 # If you want mint in selected network so set it in MINT_NETWORKS like:
 # - with 100% chance of executing:
 #   ['bsc',],
@@ -44,6 +50,34 @@ MINT_NETWORKS: List[List[Optional[str]]] = [
     # ['polygon', ]
 ]
 
+# The mint jobs of all wallets are planned from MINT_NETWORKS before the
+# run and the plan is saved to MINT_PLAN_FILE (without private keys).
+# MINT_PLAN_SEED - the seed of the plan, the same seed gives the same plan
+#   (and the same wallets order), None - a new random seed every run
+# IS_MINT_PLAN_IMPORT - run the plan saved in MINT_PLAN_FILE instead of
+#   planning a new one
+MINT_PLAN_SEED: Optional[int] = None
+MINT_PLAN_FILE = 'input_data/mint_plan.json'
+IS_MINT_PLAN_IMPORT = False
+
+# Do you want to mint in all selected networks of a wallet at the same time?
+#   Yes - True, No - False
+#   Networks have independent nonces, so the mints don't wait for each other
+#   (and SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_* is not used for them).
+IS_PARALLEL_NETWORKS = False
+
+# How many mints can be executed in one network at the same time?
+# Mints of one wallet in one network are always executed one by one.
+NETWORK_LANE_LIMITS = {
+    'ethereum': 2,
+    'bsc': 5,
+    'op_bnb': 5,
+    'arbitrum': 5,
+    'optimism': 5,
+    'polygon': 5,
+}
+DEFAULT_NETWORK_LANE_LIMIT = 3
+
 IS_SLEEP = True
 
 SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_FROM = 20  # secs
@@ -52,6 +86,160 @@ SLEEP_BETWEEN_MINT_ON_ONE_ACCOUNT_TO = 60  # secs
 SLEEP_BETWEEN_ACCS_FROM = 100  # secs
 SLEEP_BETWEEN_ACCS_TO = 600  # secs
 
+# Do you want to plan every (wallet, network) mint on a timeline instead of
+# sleeping between wallets one by one? Yes - True, No - False
+#   Mints of one wallet are spaced by SLEEP_BETWEEN_MINTS_ON_ONE_ACCOUNT_*,
+#   mints of different wallets in one network are spaced by
+#   TIMELINE_NETWORK_SPACINGS (SLEEP_BETWEEN_ACCS_* is not used),
+#   so the whole run lasts as long as the longest timeline.
+IS_TIMELINE_SCHEDULER = False
+
+# The min and max seconds between two mints in one network on the timeline,
+# about one to a few blocks of the network
+TIMELINE_NETWORK_SPACINGS = {
+    'ethereum': (12, 36),
+    'bsc': (3, 9),
+    'op_bnb': (1, 3),
+    'arbitrum': (1, 3),
+    'optimism': (2, 6),
+    'polygon': (2, 6),
+}
+DEFAULT_TIMELINE_NETWORK_SPACING = (2, 6)
+
+# RPC connection pool settings (connections are shared by all wallets)
+CONNECTOR_LIMIT = 100  # max open connections for one RPC
+CONNECTOR_LIMIT_PER_HOST = 30  # max open connections to one host
+DNS_CACHE_TTL = 300  # secs
+KEEPALIVE_TIMEOUT = 60  # secs
+
+# How often to check the RPCs of a network with several RPCs?
+# Requests go to the fastest working RPC and switch to another one on errors.
+RPC_HEALTH_CHECK_INTERVAL = 30  # secs
+
+# How long the gas price of a network is shared by all wallets?
+# A new block also refreshes it.
+GAS_ORACLE_TTL = 3  # secs
+
+# Max priority fee estimation from the last blocks (eth_feeHistory):
+# the median of the given reward percentile of FEE_HISTORY_BLOCKS blocks,
+# empty blocks (a zero reward) are not counted. If the RPC has no fee
+# history or all the blocks are empty, eth_maxPriorityFeePerGas is used.
+FEE_HISTORY_BLOCKS = 10
+PRIORITY_FEE_PERCENTILES = {
+    'ethereum': 50,
+    'polygon': 50,
+    'arbitrum': 25,
+    'optimism': 25,
+}
+DEFAULT_PRIORITY_FEE_PERCENTILE = 50
+
+# Do you want to estimate gas once for the same mint of all wallets?
+#   Yes - True, No - False
+# The estimate is increased by GAS_ESTIMATE_MARGIN and is estimated again
+# after GAS_ESTIMATE_TTL or when a transaction runs out of gas.
+# The other wallets still check their own transaction with one eth_call,
+# so a revert (not enough funds, already minted) is caught before sending.
+IS_GAS_ESTIMATE_CACHE = True
+GAS_ESTIMATE_MARGIN = 1.1
+GAS_ESTIMATE_TTL = 600  # secs
+
+# Do you want to wait for receipts of all wallets in a network together?
+#   Yes - True, No - False
+# Pending transactions are checked with one batch request per new block.
+IS_RECEIPT_WATCHER = True
+
+# Receipt waiting is adapted to the block time of every network, which is
+# learned from the last blocks every BLOCK_TIME_REFRESH_INTERVAL.
+# The timeout is RECEIPT_TIMEOUT_BLOCKS blocks, but not less than
+# MIN_RECEIPT_TIMEOUT.
+BLOCK_TIME_REFRESH_INTERVAL = 600  # secs
+RECEIPT_TIMEOUT_BLOCKS = 30
+MIN_RECEIPT_TIMEOUT = 120  # secs
+
+# Do you want to speed up stuck transactions? Yes - True, No - False
+# If a transaction is not included in FEE_BUMP_AFTER_BLOCKS blocks and its
+# fee is below the current gas price, it's replaced with the same nonce
+# and the fees multiplied by FEE_BUMP_MULTIPLIER (at least +10%, as nodes
+# require). The fees never exceed the first max fee (gas price) multiplied
+# by FEE_BUMP_MAX_MULTIPLIER and the cap of the network in FEE_BUMP_MAX_GWEI
+# (if set), a bump that doesn't fit under the caps is not sent.
+IS_FEE_BUMPING = True
+FEE_BUMP_AFTER_BLOCKS = 10
+FEE_BUMP_MULTIPLIER = 1.15  # nodes accept replacements with +10% or more
+FEE_BUMP_MAX_MULTIPLIER = 2
+FEE_BUMP_MAX_GWEI = {
+    'ethereum': 60,
+    'polygon': 500,
+}
+
+# Do you want to get new blocks via WebSocket (newHeads) instead of asking
+# RPCs for them? Yes - True, No - False
+# If WebSocket is unavailable, HTTP is used.
+IS_WS_NEW_HEADS = False
+
+# Where to sign transactions, so that signing doesn't slow down other wallets?
+#   'thread' - in a pool of threads
+#   'process' - in a pool of processes (better with many wallets at once)
+#   None - right in the main loop
+# Signing uses coincurve from requirements.txt, without it signing falls
+# back to pure Python and is several times slower. Check the backend and
+# compare the options with `python -m benchmarks.signing_benchmark`.
+SIGNING_EXECUTOR = 'thread'
+SIGNING_WORKERS = 4
+
+# Do you want to send every transaction to all RPCs of the network at once?
+# The first RPC that accepts it wins, it helps when a node is slow to
+# propagate transactions. Works for networks with several RPCs in networks.py
+IS_BROADCAST_TO_ALL_RPCS = False
+
+# Pre-signed mints: the file the signed transactions are written to and
+# how many of them are sent per second when the file is broadcast.
+# Broadcast the file soon after signing, gas prices get stale.
+# The transactions the nodes reject for good (a used nonce, a too low fee)
+# are written to the same file name with '.failed' and are not resent.
+PRESIGNED_TXS_FILE = 'input_data/presigned_txs.jsonl'
+BROADCAST_RATE = 5
+
+# Do you want to check all wallets before minting? Yes - True, No - False
+# The jobs of wallets that already have the NFT or can't pay for
+# PREFLIGHT_MINT_GAS_LIMIT gas in a network are skipped.
+IS_PREFLIGHT_CHECK = True
+PREFLIGHT_MINT_GAS_LIMIT = 150_000
+
+# Do you want to keep a local index of the wallets that already minted?
+# Yes - True, No - False
+# The mints are fetched from the Transfer logs once, later runs fetch only
+# the new blocks. MINT_INDEX_START_BLOCKS - the block the NFT contract was
+# deployed in, for every network. The first fetch starts from it, a network
+# without it is not indexed and its NFT balances are read instead.
+IS_MINT_INDEX = False
+MINT_INDEX_FILE = 'input_data/mint_index.sqlite3'
+MINT_INDEX_START_BLOCKS = {
+    # 'bsc': 35_000_000,
+}
+
+# Do you want to keep a journal of the mint jobs?
+# If the bot is stopped halfway, the next run skips the minted jobs and
+# checks the sent transactions on chain instead of sending them again.
+IS_RUN_JOURNAL = True
+RUN_JOURNAL_FILE = 'input_data/run_journal.sqlite3'
+
+# Bulk reads (balances of many wallets) via the Multicall3 contract:
+# how many calls are packed into one request and how many such requests
+# are sent at the same time
+MULTICALL_CHUNK_SIZE = 500
+MULTICALL_CONCURRENCY = 4
+
+# How many checksum addresses are kept computed
+CHECKSUM_ADDRESSES_CACHE_SIZE = 4096
+# How many wallets are kept derived from their private keys
+ACCOUNTS_CACHE_SIZE = 1024
+
+# Where to save the latency of the transaction stages and the RPC call
+# counts at the end of the work (metrics.prom for Prometheus and
+# metrics.json), None - don't save
+METRICS_FOLDER = 'logs'
+
 # Do you want to create log file for every wallet? Yes - True, No - False
 IS_CREATE_LOGS_FOR_EVERY_WALLET = False
 
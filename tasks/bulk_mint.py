@@ -0,0 +1,297 @@
+import asyncio
+import collections
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from web3 import Web3
+
+from min_library.models.client import Client
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.network.networks import Networks
+from min_library.models.network.provider_registry import (
+    PooledHTTPProvider,
+    ProviderRegistry
+)
+from min_library.models.scheduler.network_lanes import NetworkLanes
+from settings.settings import SIGNING_WORKERS
+from tasks.zk_bridge import ZkBridge
+
+
+class BulkMint:
+    """
+    Mints split into two stages, so that the CPU-heavy and the network-heavy
+    work don't slow down each other:
+        1) `presign` builds the mint transactions of all clients and signs
+            them in a process pool, the raw transactions are written to a
+            file, one JSON line per transaction;
+        2) `broadcast` streams the file and sends the raw transactions at
+            a controlled rate, the count of the lines up to the first one
+            that was not sent is saved next to the file, so a stopped
+            broadcast goes on from there and retries the failed sends.
+            A transaction the node will never take (a used nonce, a too
+            low fee) is written to the failures file and passed.
+
+    Gas prices and nonces are fixed at signing, so broadcast the file soon
+    after it is signed and don't send other transactions from the wallets
+    in between.
+
+    """
+    SENT = 'sent'
+    # Rejected for good: written to the failures file, not retried
+    FAILED = 'failed'
+    # Not sent for now: retried by the next broadcast
+    NOT_SENT = 'not sent'
+    HANDLED_STATES: tuple[str, ...] = (SENT, FAILED)
+    # The errors that resending the same signed transaction can't fix
+    PERMANENT_ERRORS: tuple[str, ...] = (
+        'nonce too low',
+        'underpriced',
+        'intrinsic gas too low',
+        'invalid sender',
+    )
+
+    def __init__(self, path: str, nft_name: str | None = None) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            path (str): the path of the file with the signed transactions.
+            nft_name (str | None): the name of the NFT from
+                `ZkBridge.MINT_DATA_DICT`, needed only to sign. (None)
+
+        """
+        self.nft_name = nft_name
+        self.path = path
+        self.offset_path = path + '.offset'
+        self.failures_path = path + '.failed'
+
+    async def _presign_one(
+        self,
+        client: Client,
+        executor: ProcessPoolExecutor
+    ) -> dict:
+        network = client.account_manager.network.name
+        transaction = client.contract.transaction
+
+        tx_params = await ZkBridge(client).get_mint_tx_params(
+            nft_name=self.nft_name,
+            network=network
+        )
+        try:
+            tx_params = await transaction.auto_add_params(tx_params)
+            signed_tx = await transaction.sign_transaction(
+                tx_params, executor=executor
+            )
+        except Exception as e:
+            if 'nonce' in tx_params:
+                transaction.release_nonce(tx_params.pop('nonce'), error=e)
+            raise
+
+        return {
+            'account': client.account_manager.account_id,
+            'network': network,
+            'nonce': tx_params['nonce'],
+            'hash': signed_tx.hash.hex(),
+            'raw': signed_tx.rawTransaction.hex()
+        }
+
+    async def presign(self, clients: list[Client]) -> int:
+        """
+        Build and sign the mint transactions of the clients, one client per
+        account and network, and write them to the file.
+
+        Args:
+            clients (list[Client]): the clients.
+
+        Returns:
+            int: the count of the signed transactions.
+
+        """
+        logger = ConsoleLoggerSingleton.get_logger()
+
+        with ProcessPoolExecutor(max_workers=SIGNING_WORKERS) as executor:
+            results = await asyncio.gather(*[
+                NetworkLanes.get_lane(client.account_manager.network.name).run(
+                    account_id=client.account_manager.account_id,
+                    func=lambda client=client: self._presign_one(
+                        client, executor
+                    )
+                ) for client in clients
+            ], return_exceptions=True)
+
+        signed_count = 0
+        with open(self.path, 'w') as file:
+            for client, result in zip(clients, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"{client.account_manager.account_id} | "
+                        f"{client.account_manager.network.name} | "
+                        f"Not signed: {result}"
+                    )
+                    continue
+
+                file.write(json.dumps(result, separators=(',', ':')) + '\n')
+                signed_count += 1
+
+        for path in (self.offset_path, self.failures_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        logger.info(
+            f"Signed {signed_count} of {len(clients)} transactions "
+            f"to {self.path}"
+        )
+
+        return signed_count
+
+    def get_offset(self) -> int:
+        if not os.path.exists(self.offset_path):
+            return 0
+
+        with open(self.offset_path) as file:
+            return int(file.read().strip() or 0)
+
+    def save_offset(self, offset: int) -> None:
+        with open(self.offset_path, 'w') as file:
+            file.write(str(offset))
+
+    @staticmethod
+    async def _is_landed(w3: Web3, line: dict, error: Exception) -> bool:
+        # A retried send of a transaction that is in the chain already
+        if not PooledHTTPProvider.is_nonce_too_low_error(error):
+            return False
+
+        try:
+            await w3.eth.get_transaction_receipt(line['hash'])
+        except Exception:
+            return False
+
+        return True
+
+    @classmethod
+    def is_permanent_error(cls, error: Exception) -> bool:
+        message = str(error).lower()
+
+        return any(text in message for text in cls.PERMANENT_ERRORS)
+
+    def save_failure(self, line_number: int, line: dict, error: Exception):
+        with open(self.failures_path, 'a') as file:
+            file.write(json.dumps({
+                'line': line_number,
+                'account': line['account'],
+                'network': line['network'],
+                'nonce': line['nonce'],
+                'hash': line['hash'],
+                'error': str(error)
+            }, separators=(',', ':')) + '\n')
+
+    async def _send_one(self, w3: Web3, line_number: int, line: dict) -> str:
+        logger = ConsoleLoggerSingleton.get_logger()
+        network = Networks.get_network(network_name=line['network'])
+
+        try:
+            await w3.eth.send_raw_transaction(line['raw'])
+        except Exception as e:
+            if (
+                not PooledHTTPProvider.is_already_known_error(e)
+                and not await self._is_landed(w3, line, e)
+            ):
+                if self.is_permanent_error(e):
+                    self.save_failure(line_number, line, e)
+                    logger.error(
+                        f"{line['account']} | {line['network']} | "
+                        f"Failed, saved to {self.failures_path}: {e}"
+                    )
+                    return self.FAILED
+
+                logger.error(
+                    f"{line['account']} | {line['network']} | "
+                    f"Not sent: {e}"
+                )
+                return self.NOT_SENT
+
+        logger.info(
+            f"{line['account']} | {line['network']} | Sent: "
+            f"{network.explorer + network.TX_PATH + line['hash']}"
+        )
+        return self.SENT
+
+    async def broadcast(
+        self,
+        rate: int | float,
+        offset: int | None = None
+    ) -> int:
+        """
+        Send the signed transactions of the file at a controlled rate.
+        A transaction the node already knows or the chain has counts as
+        sent. The saved offset doesn't go past a transaction that was not
+        sent, so the next broadcast retries it and resends the later ones,
+        which the nodes then know. A transaction rejected for good is
+        saved to the failures file and the offset goes past it.
+
+        Args:
+            rate (int | float): how many transactions are sent per second.
+            offset (int | None): the line to start from, if None, the
+                broadcast goes on from the saved offset. (None)
+
+        Returns:
+            int: the count of the sent transactions.
+
+        """
+        logger = ConsoleLoggerSingleton.get_logger()
+        if offset is None:
+            offset = self.get_offset()
+
+        tasks: list[asyncio.Task] = []
+        # The sends that were started, but not yet finished or failed, in
+        # line order; only the lines before the first of them count as
+        # handled, so that a restart doesn't skip a transaction
+        in_flight: collections.deque[tuple[int, asyncio.Task]] = (
+            collections.deque()
+        )
+        started_at = time.monotonic()
+
+        with open(self.path) as file:
+            for line_number, raw_line in enumerate(file):
+                if line_number < offset or not raw_line.strip():
+                    continue
+
+                send_at = started_at + len(tasks) / rate
+                await asyncio.sleep(max(send_at - time.monotonic(), 0))
+
+                line = json.loads(raw_line)
+                network = Networks.get_network(network_name=line['network'])
+                task = asyncio.create_task(self._send_one(
+                    ProviderRegistry.get_web3(network), line_number, line
+                ))
+                tasks.append(task)
+                in_flight.append((line_number, task))
+
+                while (
+                    in_flight
+                    and in_flight[0][1].done()
+                    and in_flight[0][1].result() in self.HANDLED_STATES
+                ):
+                    offset = in_flight.popleft()[0] + 1
+                self.save_offset(offset)
+
+        if tasks:
+            await asyncio.wait(tasks)
+        while in_flight and in_flight[0][1].result() in self.HANDLED_STATES:
+            offset = in_flight.popleft()[0] + 1
+        self.save_offset(offset)
+
+        results = [task.result() for task in tasks]
+        sent_count = results.count(self.SENT)
+        logger.info(
+            f"Sent {sent_count} of {len(tasks)} transactions from {self.path}"
+        )
+        if self.FAILED in results:
+            logger.warning(
+                f"{results.count(self.FAILED)} transactions failed for good, "
+                f"see {self.failures_path}"
+            )
+
+        return sent_count
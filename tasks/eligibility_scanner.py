@@ -0,0 +1,233 @@
+import asyncio
+from collections import Counter
+
+from eth_typing import ChecksumAddress
+
+from min_library.models.account.account_manager import AccountManager
+from min_library.models.contracts.multicall import Multicall
+from min_library.models.indexer.mint_index import MintIndex
+from min_library.models.logger.logger import ConsoleLoggerSingleton
+from min_library.models.network.network import Network
+from min_library.models.network.networks import Networks
+from min_library.models.network.provider_registry import ProviderRegistry
+from min_library.models.others.token_amount import TokenAmount
+from settings.settings import (
+    IS_MINT_INDEX,
+    MINT_INDEX_FILE,
+    MINT_INDEX_START_BLOCKS,
+    PREFLIGHT_MINT_GAS_LIMIT
+)
+from tasks.zk_bridge import ZkBridge
+
+
+class EligibilityScanner:
+    """
+    A pre-flight check of the mint jobs before any transaction is built.
+
+    The native balances and the NFT balances of all the accounts of a
+    network are read in bulk via Multicall3, all the networks at once.
+    A job is skipped if the account can't pay for the mint gas or already
+    has the NFT; a job whose balances were not received is kept.
+
+    If IS_MINT_INDEX is on, the minted NFTs are looked up in the local mint
+    index, which is synced first, instead of being read from the chain.
+
+    """
+    NO_GAS = 'not enough gas'
+    ALREADY_MINTED = 'already minted'
+
+    def __init__(self, nft_name: str) -> None:
+        """
+        Initialize the class.
+
+        Args:
+            nft_name (str): the name of the NFT from `ZkBridge.MINT_DATA_DICT`.
+
+        """
+        self.nft_name = nft_name
+        self.mint_index: MintIndex | None = None
+
+    async def get_mint_cost(self, network: Network) -> int:
+        """
+        Get the most the mint gas can cost, as the fees are set when the
+        transaction is built.
+
+        Args:
+            network (Network): the network.
+
+        Returns:
+            int: the cost in Wei.
+
+        """
+        if network.name in ZkBridge.GAS_PRICE_DICT:
+            gas_price = TokenAmount(
+                amount=ZkBridge.GAS_PRICE_DICT[network.name], decimals=9
+            ).Wei
+        else:
+            w3 = ProviderRegistry.get_web3(network)
+            gas_price = await network.gas_oracle.get_gas_price(w3)
+
+            if network.tx_type == 2:
+                gas_price += await network.gas_oracle.get_max_priority_fee(w3)
+
+        return PREFLIGHT_MINT_GAS_LIMIT * gas_price
+
+    async def get_nft_balances(
+        self,
+        network: Network,
+        mint_contract: str,
+        addresses: list[ChecksumAddress]
+    ) -> dict[ChecksumAddress, int | None]:
+        if self.mint_index:
+            try:
+                minters = await self.mint_index.sync(
+                    w3=ProviderRegistry.get_web3(network),
+                    chain_id=network.chain_id,
+                    contract=mint_contract,
+                    start_block=MINT_INDEX_START_BLOCKS.get(network.name)
+                )
+                return {
+                    address: int(address in minters) for address in addresses
+                }
+            except Exception as e:
+                ConsoleLoggerSingleton.get_logger().warning(
+                    f"Mint index {network.name}: not synced, reading "
+                    f"the balances: {e}"
+                )
+
+        return await Multicall.token_balances(
+            token=mint_contract, addresses=addresses, network=network
+        )
+
+    async def _scan_network(
+        self,
+        network_name: str,
+        addresses: list[ChecksumAddress]
+    ) -> dict[ChecksumAddress, str | None]:
+        network = Networks.get_network(network_name=network_name)
+        mint_contract = (
+            ZkBridge.MINT_DATA_DICT[self.nft_name]['networks'][network_name]
+        )
+
+        mint_cost, balances, nft_balances = await asyncio.gather(
+            self.get_mint_cost(network),
+            Multicall.balances(addresses=addresses, network=network),
+            self.get_nft_balances(network, mint_contract, addresses)
+        )
+
+        reasons = {}
+        for address in addresses:
+            balance = balances[address]
+            nft_balance = nft_balances[address]
+
+            if nft_balance:
+                reasons[address] = self.ALREADY_MINTED
+            elif balance is not None and balance.Wei < mint_cost:
+                reasons[address] = self.NO_GAS
+            else:
+                reasons[address] = None
+
+        return reasons
+
+    async def scan(
+        self,
+        plan: dict[str, list[str]],
+        private_keys: dict[str, str]
+    ) -> tuple[dict[str, list[str]], list[tuple[str, str, str]]]:
+        """
+        Check the jobs of the plan and prune the ineligible ones.
+
+        Args:
+            plan (dict[str, list[str]]): the network names of the jobs by
+                the account name.
+            private_keys (dict[str, str]): the private keys by the account
+                name.
+
+        Returns:
+            tuple[dict[str, list[str]], list[tuple[str, str, str]]]: the
+                pruned plan without the accounts that have no jobs left and
+                the (account name, network name, reason) of the skipped jobs.
+
+        """
+        logger = ConsoleLoggerSingleton.get_logger()
+        addresses = {
+            account_name: AccountManager.get_account(
+                account_name, private_keys[account_name]
+            ).address
+            for account_name in plan
+        }
+
+        network_names = sorted({
+            network_name
+            for network_names in plan.values()
+            for network_name in network_names
+        })
+        if IS_MINT_INDEX:
+            self.mint_index = MintIndex(MINT_INDEX_FILE)
+
+        try:
+            results = await asyncio.gather(*[
+                self._scan_network(network_name, [
+                    addresses[account_name]
+                    for account_name, network_names in plan.items()
+                    if network_name in network_names
+                ])
+                for network_name in network_names
+            ], return_exceptions=True)
+        finally:
+            if self.mint_index:
+                self.mint_index.close()
+                self.mint_index = None
+
+        reasons_by_network = {}
+        for network_name, result in zip(network_names, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Pre-flight {network_name}: not checked, all the jobs "
+                    f"are kept: {result}"
+                )
+                result = {}
+            reasons_by_network[network_name] = result
+
+        pruned_plan = {}
+        skipped_jobs = []
+        for account_name, network_names in plan.items():
+            eligible_network_names = []
+            for network_name in network_names:
+                reason = reasons_by_network[network_name].get(
+                    addresses[account_name]
+                )
+                if reason:
+                    skipped_jobs.append((account_name, network_name, reason))
+                else:
+                    eligible_network_names.append(network_name)
+
+            if eligible_network_names:
+                pruned_plan[account_name] = eligible_network_names
+
+        self.report(plan, skipped_jobs)
+
+        return pruned_plan, skipped_jobs
+
+    @staticmethod
+    def report(
+        plan: dict[str, list[str]],
+        skipped_jobs: list[tuple[str, str, str]]
+    ) -> None:
+        logger = ConsoleLoggerSingleton.get_logger()
+        jobs_count = sum(len(network_names) for network_names in plan.values())
+
+        logger.info(
+            f"Pre-flight: {jobs_count - len(skipped_jobs)} of {jobs_count} "
+            f"jobs are eligible"
+        )
+
+        skipped_counts = Counter(
+            (network_name, reason)
+            for _, network_name, reason in skipped_jobs
+        )
+        for (network_name, reason), count in sorted(skipped_counts.items()):
+            logger.info(f"Pre-flight {network_name}: {count} skipped, {reason}")
+
+        for account_name, network_name, reason in skipped_jobs:
+            logger.debug(f"{account_name} | {network_name} | Skipped: {reason}")
@@ -1,6 +1,7 @@
 from web3.types import TxParams
 
 from min_library.models.client import Client
+from min_library.models.journal.run_journal import RunJournal
 from min_library.models.network.networks import Networks
 from min_library.models.others.constants import LogStatus
 from min_library.models.others.token_amount import TokenAmount
@@ -32,35 +33,61 @@ class ZkBridge:
     ) -> None:
         self.client = client
 
-    async def mint(
+    async def get_mint_tx_params(
         self,
         nft_name: str,
         network: str,
-    ) -> bool:
-        try:
-            mint_contract, _ = await (
-                self.client.contract.get_contract_attributes(
-                    contract=self.MINT_DATA_DICT[nft_name]['networks'][network]
-                )
+    ) -> TxParams:
+        mint_contract, _ = await (
+            self.client.contract.get_contract_attributes(
+                contract=self.MINT_DATA_DICT[nft_name]['networks'][network]
             )
+        )
+
+        tx_params = TxParams(
+            to=mint_contract,
+            data=self.MINT_DATA_DICT[nft_name]['data']
+        )
 
-            tx_params = TxParams(
-                to=mint_contract,
-                data=self.MINT_DATA_DICT[nft_name]['data']
+        if network in self.GAS_PRICE_DICT:
+            gas_price = TokenAmount(
+                amount=self.GAS_PRICE_DICT[network], decimals=9
             )
+            tx_params['gasPrice'] = gas_price.Wei
 
-            if network in self.GAS_PRICE_DICT:
-                gas_price = TokenAmount(
-                    amount=self.GAS_PRICE_DICT[network],
-                    decimals=self.client.account_manager.network.decimals,
-                    set_gwei=True
-                )
-                tx_params['gasPrice'] = gas_price.GWei
+        return tx_params
+
+    async def mint(
+        self,
+        nft_name: str,
+        network: str,
+    ) -> bool:
+        account_manager = self.client.account_manager
+        job = dict(
+            address=account_manager.account.address,
+            network=network,
+            nft=nft_name,
+            account=account_manager.account_id
+        )
+        tx = None
+
+        try:
+            tx_params = await self.get_mint_tx_params(
+                nft_name=nft_name,
+                network=network
+            )
 
             tx = await self.client.contract.transaction.sign_and_send(
                 tx_params=tx_params
             )
-            
+            RunJournal.record(
+                **job,
+                state=RunJournal.SENT,
+                contract=tx.params['to'],
+                tx_hash=tx.hash,
+                nonce=tx.params['nonce']
+            )
+
             self.client.account_manager.custom_logger.log_message(
                 level=LogStatus.INFO,
                 message=(
@@ -68,13 +95,22 @@ class ZkBridge:
                 )
             )
 
-            receipt = await tx.wait_for_tx_receipt(
-                web3=self.client.account_manager.w3
+            receipt = await self.client.contract.transaction.wait_for_receipt(
+                tx
+            )
+            self.client.contract.transaction.check_out_of_gas(tx)
+            is_minted = receipt.get('status') == 1
+            RunJournal.record(
+                **job,
+                state=RunJournal.MINTED if is_minted else RunJournal.FAILED,
+                contract=tx.params['to'],
+                tx_hash=tx.hash,
+                nonce=tx.params['nonce']
             )
 
-            if receipt:
-                account_network = self.client.account_manager.network
-                full_path = account_network.explorer + account_network.TX_PATH
+            account_network = self.client.account_manager.network
+            full_path = account_network.explorer + account_network.TX_PATH
+            if is_minted:
                 self.client.account_manager.custom_logger.log_message(
                     level=LogStatus.MINTED,
                     message=(
@@ -83,7 +119,18 @@ class ZkBridge:
                     )
                 )
                 return True
+
+            self.client.account_manager.custom_logger.log_message(
+                level=LogStatus.ERROR,
+                message=(
+                    f'The "Polyhedra 2024" NFT mint has reverted: '
+                    f'{full_path + tx.hash.hex()}'
+                )
+            )
         except Exception as e:
+            # A sent transaction stays sent, as it may still land
+            if tx is None:
+                RunJournal.record(**job, state=RunJournal.FAILED)
             self.client.account_manager.custom_logger.log_message(
                 level=LogStatus.ERROR,
                 message=e
@@ -0,0 +1,237 @@
+"""
+Multicall tests against a local JSON-RPC stand-in of a node with the
+Multicall3 contract: `aggregate3` calls are decoded and run against the
+balances of the stand-in, with its gas and payload limits.
+
+Launch from the project folder:
+    python -m pytest tests
+"""
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
+
+import min_library.models.contracts.multicall as multicall
+from min_library.models.contracts.contract_cache import ContractCache
+from min_library.models.contracts.multicall import Multicall
+from min_library.models.network.network import Network
+from min_library.models.network.provider_registry import ProviderRegistry
+
+AGGREGATE3 = function_signature_to_4byte_selector(
+    'aggregate3((address,bool,bytes)[])'
+)
+GET_ETH_BALANCE = function_signature_to_4byte_selector('getEthBalance(address)')
+BALANCE_OF = function_signature_to_4byte_selector('balanceOf(address)')
+GET_RESERVES = function_signature_to_4byte_selector('getReserves()')
+
+TOKEN = '0x' + '70' * 20
+BROKEN_TOKEN = '0x' + 'de' * 20
+PAIR = '0x' + 'a1' * 20
+ADDRESSES = [
+    '0x' + (index + 1).to_bytes(20, 'big').hex() for index in range(10)
+]
+
+
+class EvmRpcStandIn:
+    """
+    A JSON-RPC node with the Multicall3 contract: the native balances,
+    a token with `balanceOf`, a token whose calls revert and a pair with
+    `getReserves`. An `aggregate3` of more than `max_calls` calls runs out
+    of gas and a request larger than `max_body_size` gets HTTP 413.
+
+    """
+
+    def __init__(
+        self,
+        max_calls: int | None = None,
+        max_body_size: int | None = None
+    ) -> None:
+        self.max_calls = max_calls
+        self.max_body_size = max_body_size
+        self.aggregated_sizes: list[int] = []
+        self.refused_sizes: list[int] = []
+        self.runner = None
+        self.port = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}/'
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post('/', self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+    @staticmethod
+    def get_balance(address: str) -> int:
+        return int(address, 16) * 10 ** 15
+
+    def _call(self, target: str, call_data: bytes) -> tuple[bool, bytes]:
+        selector, arguments = call_data[:4], call_data[4:]
+
+        if target == Multicall.ADDRESS.lower() and selector == GET_ETH_BALANCE:
+            address = decode(['address'], arguments)[0]
+            return True, encode(['uint256'], [self.get_balance(address)])
+
+        if target == TOKEN and selector == BALANCE_OF:
+            address = decode(['address'], arguments)[0]
+            return True, encode(['uint256'], [int(address, 16) % 2])
+
+        if target == PAIR and selector == GET_RESERVES:
+            return True, encode(['uint112', 'uint112'], [7, 11])
+
+        return False, b''
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        payload = json.loads(body)
+        data = bytes.fromhex(payload['params'][0]['data'][2:])
+        calls = decode(['(address,bool,bytes)[]'], data[4:])[0]
+
+        if self.max_body_size and len(body) > self.max_body_size:
+            self.refused_sizes.append(len(calls))
+            return web.Response(status=413)
+
+        if self.max_calls and len(calls) > self.max_calls:
+            self.refused_sizes.append(len(calls))
+            return web.json_response({
+                'jsonrpc': '2.0',
+                'id': payload['id'],
+                'error': {'code': -32000, 'message': 'out of gas'}
+            })
+
+        assert payload['method'] == 'eth_call'
+        assert data[:4] == AGGREGATE3
+        self.aggregated_sizes.append(len(calls))
+        results = [
+            self._call(target.lower(), call_data)
+            for target, _, call_data in calls
+        ]
+
+        return web.json_response({
+            'jsonrpc': '2.0',
+            'id': payload['id'],
+            'result': '0x' + encode(['(bool,bytes)[]'], [results]).hex()
+        })
+
+
+def get_network(name: str, rpc: str) -> Network:
+    return Network(
+        name=name, rpc=rpc, chain_id=1, coin_symbol='ETH', decimals=18
+    )
+
+
+def run_with_node(node: EvmRpcStandIn, network_name: str, test) -> None:
+    async def run() -> None:
+        await node.start()
+        try:
+            await test(get_network(network_name, node.url))
+        finally:
+            await ProviderRegistry.close()
+            ProviderRegistry.WEB3S.clear()
+            await node.stop()
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def chunk_size(monkeypatch):
+    def set_chunk_size(size: int) -> None:
+        monkeypatch.setattr(multicall, 'MULTICALL_CHUNK_SIZE', size)
+
+    return set_chunk_size
+
+
+def test_chunks_keep_order(chunk_size):
+    chunk_size(4)
+    node = EvmRpcStandIn()
+
+    async def test(network: Network) -> None:
+        balances = await Multicall.balances(ADDRESSES, network)
+
+        assert sorted(node.aggregated_sizes) == [2, 4, 4]
+        assert [balance.Wei for balance in balances.values()] == [
+            node.get_balance(address) for address in ADDRESSES
+        ]
+
+    run_with_node(node, 'multicall_chunks', test)
+
+
+def test_splits_chunk_on_rpc_error(chunk_size):
+    chunk_size(10)
+    node = EvmRpcStandIn(max_calls=3)
+
+    async def test(network: Network) -> None:
+        balances = await Multicall.balances(ADDRESSES, network)
+
+        assert node.refused_sizes[0] == 10
+        assert max(node.aggregated_sizes) <= 3
+        assert sum(node.aggregated_sizes) == len(ADDRESSES)
+        assert [balance.Wei for balance in balances.values()] == [
+            node.get_balance(address) for address in ADDRESSES
+        ]
+
+    run_with_node(node, 'multicall_gas', test)
+
+
+def test_splits_chunk_on_payload_too_large(chunk_size):
+    chunk_size(10)
+    node = EvmRpcStandIn(max_body_size=1_500)
+
+    async def test(network: Network) -> None:
+        balances = await Multicall.token_balances(TOKEN, ADDRESSES, network)
+
+        assert node.refused_sizes[0] == 10
+        assert sum(node.aggregated_sizes) == len(ADDRESSES)
+        assert list(balances.values()) == [
+            int(address, 16) % 2 for address in ADDRESSES
+        ]
+
+    run_with_node(node, 'multicall_payload', test)
+
+
+def test_decodes_results_and_failed_calls(chunk_size):
+    chunk_size(500)
+    node = EvmRpcStandIn()
+    get_reserves = ContractCache.get_function([{
+        'name': 'getReserves',
+        'type': 'function',
+        'stateMutability': 'view',
+        'inputs': [],
+        'outputs': [
+            {'name': 'reserve0', 'type': 'uint112'},
+            {'name': 'reserve1', 'type': 'uint112'}
+        ]
+    }], 'getReserves')
+
+    async def test(network: Network) -> None:
+        balance_of = ContractCache.get_function(
+            Multicall.BALANCE_OF_ABI, 'balanceOf'
+        )
+        results = await Multicall.aggregate(
+            calls=[
+                (TOKEN, balance_of, (ADDRESSES[0],)),
+                (BROKEN_TOKEN, balance_of, (ADDRESSES[0],)),
+                (PAIR, get_reserves, ())
+            ],
+            network=network
+        )
+
+        assert results == [1, None, (7, 11)]
+
+        balances = await Multicall.token_balances(
+            BROKEN_TOKEN, ADDRESSES[:2], network
+        )
+        assert list(balances.values()) == [None, None]
+
+    run_with_node(node, 'multicall_decode', test)
@@ -0,0 +1,283 @@
+"""
+NewHeadsListener tests against a local WebSocket JSON-RPC stand-in that
+answers `eth_subscribe` and pushes `newHeads` notifications.
+
+Launch from the project folder:
+    python -m pytest tests
+"""
+import asyncio
+import json
+
+import pytest
+import websockets
+
+import min_library.models.network.new_heads_listener as new_heads_listener
+from min_library.models.network.network import Network
+from min_library.models.network.new_heads_listener import NewHeadsListener
+from min_library.models.transactions.receipt_watcher import ReceiptWatcher
+
+TX_HASH = '0x' + '12' * 32
+
+
+class WsRpcStandIn:
+    """
+    A WebSocket JSON-RPC node that pushes the heads given to `push_head`
+    to its subscribers and can drop their connections.
+
+    """
+
+    def __init__(self) -> None:
+        self.subscriptions: list[dict] = []
+        self.connections: set = set()
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        port = self.server.sockets[0].getsockname()[1]
+
+        return f'ws://127.0.0.1:{port}'
+
+    async def start(self) -> None:
+        self.server = await websockets.serve(self._handle, '127.0.0.1', 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, websocket) -> None:
+        request = json.loads(await websocket.recv())
+        self.subscriptions.append(request)
+        await websocket.send(json.dumps({
+            'jsonrpc': '2.0', 'id': request['id'], 'result': '0x1'
+        }))
+
+        self.connections.add(websocket)
+        try:
+            await websocket.wait_closed()
+        finally:
+            self.connections.discard(websocket)
+
+    async def push_head(self, block_number: int) -> None:
+        message = json.dumps({
+            'jsonrpc': '2.0',
+            'method': 'eth_subscription',
+            'params': {
+                'subscription': '0x1',
+                'result': {'number': hex(block_number)}
+            }
+        })
+        for websocket in list(self.connections):
+            await websocket.send(message)
+
+    async def drop_connections(self) -> None:
+        for websocket in list(self.connections):
+            await websocket.close()
+
+
+class HttpEthStandIn:
+    def __init__(self) -> None:
+        self.latest_block = 100
+        self.block_number_calls = 0
+
+    @property
+    async def block_number(self) -> int:
+        self.block_number_calls += 1
+
+        return self.latest_block
+
+
+class HttpProviderStandIn:
+    def __init__(self) -> None:
+        self.receipts: dict[str, dict] = {}
+        self.endpoint_uri = 'http://127.0.0.1'
+
+    async def make_batch_request(self, requests: list) -> list[dict]:
+        return [
+            {'jsonrpc': '2.0', 'id': 1, 'result': self.receipts.get(params[0])}
+            for _, params in requests
+        ]
+
+
+class HttpRpcStandIn:
+    """
+    The HTTP side of the node the receipt watcher polls: the latest block
+    number and the batched receipts of the landed transactions.
+
+    """
+
+    def __init__(self) -> None:
+        self.eth = HttpEthStandIn()
+        self.provider = HttpProviderStandIn()
+
+    def land(self, tx_hash: str, block_number: int) -> None:
+        self.eth.latest_block = block_number
+        self.provider.receipts[tx_hash] = {
+            'transactionHash': tx_hash,
+            'blockNumber': hex(block_number),
+            'status': '0x1'
+        }
+
+
+def get_network(name: str, ws_rpc: str, block_time: float) -> Network:
+    return Network(
+        name=name,
+        rpc='http://127.0.0.1',
+        chain_id=1,
+        coin_symbol='ETH',
+        decimals=18,
+        block_time=block_time,
+        ws_rpc=ws_rpc
+    )
+
+
+async def wait_until(condition, timeout: float = 2) -> None:
+    async def _wait() -> None:
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_wait(), timeout)
+
+
+@pytest.fixture(autouse=True)
+def ws_new_heads(monkeypatch):
+    monkeypatch.setattr(new_heads_listener, 'IS_WS_NEW_HEADS', True)
+    yield
+    NewHeadsListener.stop_all()
+    NewHeadsListener.LISTENERS.clear()
+    ReceiptWatcher.WATCHERS.clear()
+
+
+def test_subscribes_and_invalidates_gas_oracle():
+    async def run() -> None:
+        node = WsRpcStandIn()
+        await node.start()
+        network = get_network('ws_oracle', node.url, block_time=2)
+        gas_price_fetches = []
+
+        async def fetch_gas_price() -> int:
+            gas_price_fetches.append(1)
+            return 10 ** 9
+
+        listener = NewHeadsListener.start_for(network)
+        await wait_until(lambda: listener.is_connected)
+        assert node.subscriptions[0]['method'] == 'eth_subscribe'
+        assert node.subscriptions[0]['params'] == ['newHeads']
+
+        await network.gas_oracle.get('gas_price', fetch_gas_price)
+        await network.gas_oracle.get('gas_price', fetch_gas_price)
+        assert len(gas_price_fetches) == 1
+
+        await node.push_head(101)
+        assert await listener.wait_for_new_head(timeout=2) == 101
+        assert network.gas_oracle.block_number == 101
+
+        await network.gas_oracle.get('gas_price', fetch_gas_price)
+        assert len(gas_price_fetches) == 2
+
+        NewHeadsListener.stop_all()
+        await node.stop()
+
+    asyncio.run(run())
+
+
+def test_new_head_wakes_receipt_watcher():
+    async def run() -> None:
+        node = WsRpcStandIn()
+        await node.start()
+        # A long block time: without the pushed head the watcher would
+        # wait for seconds before checking the receipts
+        network = get_network('ws_receipts', node.url, block_time=30)
+        web3 = HttpRpcStandIn()
+
+        listener = NewHeadsListener.start_for(network)
+        await wait_until(lambda: listener.is_connected)
+
+        receipt_task = asyncio.create_task(
+            ReceiptWatcher.get_watcher(network).wait(
+                web3=web3, tx_hash=TX_HASH, timeout=10
+            )
+        )
+        await asyncio.sleep(0.1)
+        web3.land(TX_HASH, 101)
+        await node.push_head(101)
+
+        receipt = await asyncio.wait_for(receipt_task, 1)
+        assert receipt['status'] == 1
+        assert receipt['blockNumber'] == 101
+
+        NewHeadsListener.stop_all()
+        await node.stop()
+
+    asyncio.run(run())
+
+
+def test_falls_back_to_http_when_socket_drops():
+    async def run() -> None:
+        node = WsRpcStandIn()
+        await node.start()
+        network = get_network('ws_fallback', node.url, block_time=0.3)
+        web3 = HttpRpcStandIn()
+
+        listener = NewHeadsListener.start_for(network)
+        listener.reconnect_delay = 60
+        await wait_until(lambda: listener.is_connected)
+
+        await node.drop_connections()
+        await wait_until(lambda: not listener.is_connected)
+
+        receipt_task = asyncio.create_task(
+            ReceiptWatcher.get_watcher(network).wait(
+                web3=web3, tx_hash=TX_HASH, timeout=10
+            )
+        )
+        web3.land(TX_HASH, 101)
+
+        receipt = await asyncio.wait_for(receipt_task, 2)
+        assert receipt['status'] == 1
+        assert web3.eth.block_number_calls > 0
+
+        NewHeadsListener.stop_all()
+        await node.stop()
+
+    asyncio.run(run())
+
+
+class LoggerStandIn:
+    def __init__(self) -> None:
+        self.warnings: list[str] = []
+
+    def warning(self, message: str) -> None:
+        self.warnings.append(message)
+
+
+def test_gives_up_after_failed_reconnections(monkeypatch):
+    logger = LoggerStandIn()
+    monkeypatch.setattr(
+        new_heads_listener.ConsoleLoggerSingleton, 'get_logger', lambda: logger
+    )
+
+    async def run() -> None:
+        node = WsRpcStandIn()
+        await node.start()
+        # Nothing listens on the port of the stopped node
+        network = get_network('ws_unavailable', node.url, block_time=2)
+        await node.stop()
+
+        listener = NewHeadsListener(
+            network=network,
+            ws_rpc=network.ws_rpc,
+            reconnect_delay=0.01,
+            max_reconnect_delay=0.04,
+            max_failures=5
+        )
+        NewHeadsListener.LISTENERS[network.name] = listener
+        assert NewHeadsListener.start_for(network) is listener
+
+        await wait_until(lambda: listener.is_given_up)
+        assert not listener.is_connected
+        assert len(logger.warnings) == 2
+        assert 'reconnecting' in logger.warnings[0]
+        assert '5 times' in logger.warnings[1]
+        assert NewHeadsListener.start_for(network) is None
+
+    asyncio.run(run())
@@ -0,0 +1,227 @@
+"""
+PendingTxTracker tests: the fee bump arithmetic of the replacements and
+a replacement chain against a stand-in node that lands a replacement.
+
+Launch from the project folder:
+    python -m pytest tests
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+import min_library.models.transactions.pending_tx_tracker as pending_tx_tracker
+from min_library.models.network.network import Network
+from min_library.models.others.token_amount import TokenAmount
+from min_library.models.transactions.pending_tx_tracker import PendingTxTracker
+from min_library.models.transactions.receipt_watcher import ReceiptWatcher
+from min_library.models.transactions.tx import Tx
+
+GWEI = 10 ** 9
+
+
+class LoggerStandIn:
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, str]] = []
+
+    def log_message(self, level: str, message: str) -> None:
+        self.messages.append((level, message))
+
+
+class EthStandIn:
+    def __init__(self, land_on_send: int) -> None:
+        self.land_on_send = land_on_send
+        self.latest_block = 100
+        self.sent: list[HexBytes] = []
+        self.receipts: dict[str, dict] = {}
+
+    @property
+    async def block_number(self) -> int:
+        self.latest_block += 1
+
+        return self.latest_block
+
+    async def get_block(self, block_identifier):
+        raise ValueError('not supported by the stand-in')
+
+    async def send_raw_transaction(self, transaction: bytes) -> HexBytes:
+        tx_hash = HexBytes(keccak(transaction))
+        self.sent.append(tx_hash)
+        if len(self.sent) == self.land_on_send:
+            self.receipts[tx_hash.hex()] = {
+                'transactionHash': tx_hash.hex(),
+                'blockNumber': hex(self.latest_block),
+                'status': '0x1'
+            }
+
+        return tx_hash
+
+
+class ProviderStandIn:
+    def __init__(self, eth: EthStandIn) -> None:
+        self.eth = eth
+        self.endpoint_uri = 'http://127.0.0.1'
+
+    async def make_batch_request(self, requests: list) -> list[dict]:
+        return [
+            {'jsonrpc': '2.0', 'id': 1, 'result': self.eth.receipts.get(params[0])}
+            for _, params in requests
+        ]
+
+
+class TransactionStandIn:
+    """
+    The transaction helper of an account: it signs by hashing the
+    parameters and reports a gas price above the sent fees.
+
+    """
+
+    def __init__(self, network: Network, gas_price: int, land_on_send: int = 0):
+        eth = EthStandIn(land_on_send=land_on_send)
+        self.gas_price = gas_price
+        self.account_manager = SimpleNamespace(
+            network=network,
+            w3=SimpleNamespace(eth=eth, provider=ProviderStandIn(eth)),
+            custom_logger=LoggerStandIn()
+        )
+
+    async def get_gas_price(self) -> TokenAmount:
+        return TokenAmount(amount=self.gas_price, wei=True)
+
+    async def sign_transaction(self, tx_params: dict) -> SimpleNamespace:
+        raw_transaction = repr(sorted(tx_params.items())).encode()
+
+        return SimpleNamespace(
+            rawTransaction=raw_transaction,
+            hash=HexBytes(keccak(raw_transaction))
+        )
+
+
+def get_network(name: str, block_time: float = 2) -> Network:
+    return Network(
+        name=name,
+        rpc='http://127.0.0.1',
+        chain_id=1,
+        coin_symbol='ETH',
+        decimals=18,
+        block_time=block_time
+    )
+
+
+def get_tracker(network_name: str = 'bump_math') -> PendingTxTracker:
+    return PendingTxTracker(
+        TransactionStandIn(get_network(network_name), gas_price=200 * GWEI)
+    )
+
+
+def assert_replaceable(tx_params: dict, bumped_params: dict) -> None:
+    for fee_key in PendingTxTracker.get_fee_keys(tx_params):
+        assert bumped_params[fee_key] >= tx_params[fee_key] * 110 // 100 + 1
+
+
+@pytest.fixture(autouse=True)
+def fee_bump_settings(monkeypatch):
+    monkeypatch.setattr(pending_tx_tracker, 'FEE_BUMP_MULTIPLIER', 1.15)
+    monkeypatch.setattr(pending_tx_tracker, 'FEE_BUMP_MAX_MULTIPLIER', 2)
+    monkeypatch.setattr(pending_tx_tracker, 'FEE_BUMP_MAX_GWEI', {})
+    yield
+    ReceiptWatcher.WATCHERS.clear()
+
+
+def test_bumps_zero_tip_by_at_least_one_wei():
+    tracker = get_tracker()
+    tx_params = {'maxFeePerGas': 100 * GWEI, 'maxPriorityFeePerGas': 0}
+
+    bumped_params = tracker.get_bumped_params(
+        tx_params, tracker.get_fee_caps(tx_params)
+    )
+
+    assert bumped_params['maxFeePerGas'] == int(100 * GWEI * 1.15)
+    assert bumped_params['maxPriorityFeePerGas'] == 1
+    assert_replaceable(tx_params, bumped_params)
+
+
+def test_bumps_tiny_gas_price_by_more_than_ten_percent():
+    tracker = get_tracker()
+    tx_params = {'gasPrice': 5}
+
+    bumped_params = tracker.get_bumped_params(
+        tx_params, tracker.get_fee_caps(tx_params)
+    )
+
+    # 5 * 1.15 rounds down to 5, the least accepted replacement is 6
+    assert bumped_params['gasPrice'] == 6
+    assert_replaceable(tx_params, bumped_params)
+
+
+def test_bumps_tip_capped_by_max_fee_by_at_least_ten_percent():
+    tracker = get_tracker()
+    tx_params = {'maxFeePerGas': 100 * GWEI, 'maxPriorityFeePerGas': 100 * GWEI}
+
+    bumped_params = tracker.get_bumped_params(
+        tx_params, tracker.get_fee_caps(tx_params)
+    )
+
+    assert bumped_params['maxPriorityFeePerGas'] == bumped_params['maxFeePerGas']
+    assert_replaceable(tx_params, bumped_params)
+
+
+def test_no_bump_when_caps_leave_less_than_ten_percent(monkeypatch):
+    tracker = get_tracker('bump_caps')
+    first_params = {'maxFeePerGas': 100 * GWEI, 'maxPriorityFeePerGas': GWEI}
+    fee_caps = tracker.get_fee_caps(first_params)
+
+    # 1.15 would cross the cap of 2x, but +10% still fits under it
+    tx_params = {'maxFeePerGas': 180 * GWEI, 'maxPriorityFeePerGas': GWEI}
+    bumped_params = tracker.get_bumped_params(tx_params, fee_caps)
+    assert bumped_params['maxFeePerGas'] == 200 * GWEI
+    assert_replaceable(tx_params, bumped_params)
+
+    tx_params = {'maxFeePerGas': 190 * GWEI, 'maxPriorityFeePerGas': GWEI}
+    assert tracker.get_bumped_params(tx_params, fee_caps) is None
+
+    monkeypatch.setattr(pending_tx_tracker, 'FEE_BUMP_MAX_GWEI', {'bump_caps': 105})
+    assert tracker.get_bumped_params(
+        first_params, tracker.get_fee_caps(first_params)
+    ) is None
+
+
+def test_replacement_chain_lands_bumped_transaction(monkeypatch):
+    monkeypatch.setattr(pending_tx_tracker, 'FEE_BUMP_AFTER_BLOCKS', 25)
+
+    async def run() -> None:
+        transaction = TransactionStandIn(
+            get_network('bump_chain', block_time=0.02),
+            gas_price=200 * GWEI,
+            land_on_send=2
+        )
+        w3 = transaction.account_manager.w3
+        tx_params = {
+            'nonce': 7,
+            'maxFeePerGas': 100 * GWEI,
+            'maxPriorityFeePerGas': 0
+        }
+        tx = Tx(tx_hash=HexBytes(b'\x01' * 32), params=tx_params)
+
+        receipt = await asyncio.wait_for(
+            PendingTxTracker(transaction).wait(tx), 5
+        )
+
+        assert receipt['status'] == 1
+        assert len(w3.eth.sent) == 2
+        assert tx.hash == w3.eth.sent[1]
+        assert tx.params['nonce'] == 7
+
+        first_bump = {
+            'maxFeePerGas': int(100 * GWEI * 1.15),
+            'maxPriorityFeePerGas': 1
+        }
+        assert_replaceable(tx_params, first_bump)
+        assert_replaceable(first_bump, tx.params)
+
+        messages = transaction.account_manager.custom_logger.messages
+        assert not any('Replacement failed' in message for _, message in messages)
+
+    asyncio.run(run())